@@ -0,0 +1,288 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import time
+
+import duckdb
+
+from export_manager import ExportManager
+
+DEFAULT_ROWS = [10000, 100000]
+DEFAULT_THRESHOLD = 0.10
+
+# Each shape is a SELECT over range(rows) AS r(i), so any size can be generated
+# inside DuckDB without building rows in Python.
+SHAPES = {
+    "narrow_numeric": "SELECT i AS id, (i * 7) % 1000 AS qty, i / 3.0 AS price",
+    "wide_numeric": "SELECT i AS id, "
+    + ", ".join(f"(i * {n}) % 100003 AS c{n}, i / {n}.5 AS d{n}" for n in range(1, 26)),
+    "text_heavy": "SELECT i AS id, "
+    + ", ".join(
+        f"repeat(md5(CAST(i + {n} AS VARCHAR)), {n}) AS t{n}" for n in range(1, 6)
+    ),
+    "null_dense": "SELECT i AS id, "
+    + ", ".join(
+        f"CASE WHEN (i + {n}) % 10 = 0 THEN i * {n} END AS n{n}" for n in range(1, 11)
+    ),
+    "mixed": (
+        "SELECT i AS id, 'name ' || i AS name, CAST(i % 1000 AS DECIMAL(10, 2)) "
+        "AS amount, DATE '2020-01-01' + CAST(i % 3650 AS INTEGER) AS day, "
+        "TIMESTAMP '2020-01-01' + to_seconds(i) AS ts, i % 2 = 0 AS active, "
+        "CASE WHEN i % 5 = 0 THEN NULL ELSE 'x''y <' || i || '>' END AS note"
+    ),
+}
+
+TABLE_FORMATS = {
+    "sql": ("export_table_sql", ".sql", {}),
+    "csv": ("export_table_csv", ".csv", {}),
+    "json": ("export_table_json", ".json", {}),
+    "parquet": ("export_table_parquet", ".parquet", {}),
+    "html": ("export_table_html", ".html", {}),
+    "xml": ("export_table_xml", ".xml", {}),
+    "sqlite": ("export_table_sqlite", ".db", {}),
+    "incremental": ("export_table_incremental", ".parquet", {"watermark_column": "id"}),
+}
+
+ALL_TABLES_FORMATS = {
+    "all_sql": ("export_all_tables_sql", ".sql"),
+    "all_html": ("export_all_tables_html", ".html"),
+    "all_sqlite": ("export_all_tables_sqlite", ".db"),
+}
+
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux kilobytes.
+        return peak if sys.platform == "darwin" else peak * 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss)
+
+
+def output_size(path):
+    size = 0
+    for root, _, files in os.walk(path):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size
+
+
+def create_database(work_dir, rows, shapes):
+    db_path = os.path.join(work_dir, f"bench_{rows}.duckdb")
+    conn = duckdb.connect(db_path)
+    try:
+        existing = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+        for shape in shapes:
+            if shape not in existing:
+                conn.execute(
+                    f"CREATE TABLE {shape} AS {SHAPES[shape]} "
+                    f"FROM range({int(rows)}) AS r(i)"
+                )
+    finally:
+        conn.close()
+    return db_path
+
+
+def run_case(db_path, case, method, args, kwargs, out_dir, rows):
+    # Runs in a fresh process so peak RSS belongs to this case alone.
+    export_manager = ExportManager(db_path)
+    try:
+        started = time.perf_counter()
+        result = getattr(export_manager, method)(*args, **kwargs)
+        seconds = time.perf_counter() - started
+    except Exception as e:
+        return dict(case, rows=rows, status="failed", error=str(e))
+    finally:
+        export_manager.close()
+    if result is False:
+        return dict(case, rows=rows, status="failed", error="export returned False")
+    # The whole directory is measured, since some exports write several files.
+    size = output_size(out_dir)
+    return dict(
+        case,
+        status="ok",
+        rows=rows,
+        seconds=seconds,
+        rows_per_second=rows / seconds if seconds else None,
+        bytes=size,
+        mb_per_second=size / (1024 * 1024) / seconds if seconds else None,
+        peak_rss=peak_rss(),
+    )
+
+
+def plan_cases(out_dir, rows, shapes, formats):
+    cases = []
+    for shape in shapes:
+        for file_format in formats:
+            if file_format not in TABLE_FORMATS:
+                continue
+            method, extension, kwargs = TABLE_FORMATS[file_format]
+            output = os.path.join(out_dir, f"{shape}_{file_format}{extension}")
+            if file_format == "incremental":
+                kwargs = dict(
+                    kwargs, state_file=os.path.join(out_dir, f"{shape}_state.json")
+                )
+            case = {"size": rows, "shape": shape, "format": file_format}
+            cases.append((case, method, (shape, output), kwargs, rows))
+    for file_format in formats:
+        if file_format not in ALL_TABLES_FORMATS:
+            continue
+        method, extension = ALL_TABLES_FORMATS[file_format]
+        output = os.path.join(out_dir, f"all_tables{extension}")
+        # Runs over different table sets must not be compared with each other.
+        shape = "all" if set(shapes) == set(SHAPES) else "+".join(shapes)
+        case = {"size": rows, "shape": shape, "format": file_format}
+        cases.append((case, method, (output, list(shapes)), {}, rows * len(shapes)))
+    return cases
+
+
+def run_benchmarks(sizes, shapes, formats, work_dir, repeat=1):
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for rows in sizes:
+            db_path = create_database(work_dir, rows, shapes)
+            out_dir = os.path.join(work_dir, f"out_{rows}")
+            for case, method, args, kwargs, row_count in plan_cases(
+                out_dir, rows, shapes, formats
+            ):
+                runs = []
+                for _ in range(repeat):
+                    shutil.rmtree(out_dir, ignore_errors=True)
+                    os.makedirs(out_dir)
+                    runs.append(
+                        pool.apply(
+                            run_case,
+                            (db_path, case, method, args, kwargs, out_dir, row_count),
+                        )
+                    )
+                failed = [run for run in runs if run["status"] != "ok"]
+                if failed:
+                    results.append(failed[0])
+                    print(
+                        f"{case['format']:>12} {case['shape']:>15} {rows:>11} rows: "
+                        f"failed: {failed[0]['error']}",
+                        file=sys.stderr,
+                    )
+                    continue
+                # The fastest run is the least disturbed by the rest of the
+                # machine.
+                result = min(runs, key=lambda run: run["seconds"])
+                results.append(result)
+                print(
+                    f"{case['format']:>12} {case['shape']:>15} {rows:>11} rows: "
+                    f"{result['seconds']:8.3f}s {result['rows_per_second']:12.0f} "
+                    f"rows/s {result['mb_per_second']:8.1f} MB/s",
+                    file=sys.stderr,
+                )
+            shutil.rmtree(out_dir, ignore_errors=True)
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    def key(result):
+        return (result["size"], result["shape"], result["format"])
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        previous = baseline_results.get(key(result))
+        if result["status"] != "ok" or not previous or previous["status"] != "ok":
+            continue
+        change = result["rows_per_second"] / previous["rows_per_second"] - 1
+        comparisons.append(
+            {
+                "size": result["size"],
+                "shape": result["shape"],
+                "format": result["format"],
+                "baseline_rows_per_second": previous["rows_per_second"],
+                "rows_per_second": result["rows_per_second"],
+                "change": change,
+                "regression": change < -threshold,
+            }
+        )
+    return comparisons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark ExportManager against synthetic DuckDB databases."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    run.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=None)
+    run.add_argument(
+        "--formats",
+        nargs="+",
+        choices=sorted(TABLE_FORMATS) + sorted(ALL_TABLES_FORMATS),
+        default=None,
+    )
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument("--work-dir", default="benchmark_data")
+    run.add_argument("--output", default="benchmark_report.json")
+
+    compare = commands.add_parser("compare", help="compare two benchmark reports")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative rows/s drop reported as a regression (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(
+            args.rows,
+            args.shapes or list(SHAPES),
+            args.formats or list(TABLE_FORMATS) + list(ALL_TABLES_FORMATS),
+            args.work_dir,
+            args.repeat,
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to: {args.output}")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    comparisons = compare_reports(baseline, current, args.threshold)
+    for comparison in comparisons:
+        flag = "SLOWER" if comparison["regression"] else ""
+        print(
+            f"{comparison['format']:>12} {comparison['shape']:>15} "
+            f"{comparison['size']:>11} rows: {comparison['change']:+7.1%} {flag}"
+        )
+    regressions = [c for c in comparisons if c["regression"]]
+    if regressions:
+        print(f"{len(regressions)} slowdown(s) beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import json
+import os
+
+from compression import compress_bytes
+
+
+class ExportCheckpoint:
+    # An export in progress is written to "<output>.partial" and its progress
+    # to the "<output>.checkpoint.json" sidecar. A rerun with the same settings
+    # carries on from the last commit; finish() moves the file into place.
+    PARTIAL_SUFFIX = ".partial"
+    STATE_SUFFIX = ".checkpoint.json"
+
+    def __init__(self, output_file, settings):
+        self.output_file = output_file
+        self.partial_file = output_file + self.PARTIAL_SUFFIX
+        self.state_file = output_file + self.STATE_SUFFIX
+        self.state = self._load(json.loads(json.dumps(settings)))
+        self.file = None
+        self.compression = None
+        self.buffer = []
+
+    def _load(self, settings):
+        if os.path.exists(self.state_file) and os.path.exists(self.partial_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except ValueError:
+                state = {}
+            if state.get("settings") == settings:
+                return state
+        if os.path.exists(self.partial_file):
+            os.remove(self.partial_file)
+        return {"settings": settings, "bytes": 0, "tables": {}, "complete": False}
+
+    def progress(self, table_name):
+        return self.state["tables"].get(table_name)
+
+    def start_table(self, table_name):
+        progress = {"rows": 0, "key": None, "done": False}
+        self.state["tables"][table_name] = progress
+        return progress
+
+    def save(self):
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def open_stream(self, compression=None):
+        # Anything past the last commit is cut off, so a resumed file continues
+        # exactly where the recorded progress ends.
+        size = self.state["bytes"]
+        self.compression = compression
+        self.file = open(self.partial_file, "r+b" if size else "wb")
+        self.file.truncate(size)
+        self.file.seek(size)
+
+    def write(self, text):
+        self.buffer.append(text)
+
+    def commit(self):
+        # The data reaches the disk before the progress that refers to it. A
+        # compressed chunk is one more gzip member or zstd frame, so the file is
+        # valid at every committed size.
+        if self.file is not None:
+            data = "".join(self.buffer).encode("utf-8")
+            self.buffer = []
+            if data:
+                if self.compression:
+                    data = compress_bytes(data, self.compression)
+                self.file.write(data)
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            self.state["bytes"] = self.file.tell()
+        elif os.path.exists(self.partial_file):
+            self.state["bytes"] = os.path.getsize(self.partial_file)
+        self.save()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        self.close()
+        os.replace(self.partial_file, self.output_file)
+        os.remove(self.state_file)
@@ -0,0 +1,261 @@
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+from db_manager import DBManager
+from export_manager import ExportManager
+from export_metrics import ExportMetrics, JsonLinesLog
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INVALID = 2
+
+TABLE_FORMATS = {
+    "structure": "export_table_structure_only",
+    "sql": "export_table_sql",
+    "csv": "export_table_csv",
+    "json": "export_table_json",
+    "parquet": "export_table_parquet",
+    "html": "export_table_html",
+    "xml": "export_table_xml",
+    "sqlite": "export_table_sqlite",
+    "incremental": "export_table_incremental",
+}
+
+SINGLE_FILE_FORMATS = {
+    "sql": "export_all_tables_sql",
+    "html": "export_all_tables_html",
+    "sqlite": "export_all_tables_sqlite",
+    "snapshot": "export_database_snapshot",
+}
+
+
+class JobSpecError(Exception):
+    pass
+
+
+def load_job_spec(path):
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise JobSpecError("PyYAML is required to read YAML job specs")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if not isinstance(spec, dict) or not spec.get("database"):
+        raise JobSpecError("The job spec must name a 'database'")
+    if not isinstance(spec.get("jobs"), list) or not spec["jobs"]:
+        raise JobSpecError("The job spec must contain a non-empty 'jobs' list")
+    return spec
+
+
+def match_tables(patterns, tables):
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    matched = []
+    for table in tables:
+        if any(fnmatch.fnmatchcase(table, pattern) for pattern in patterns):
+            matched.append(table)
+    return matched
+
+
+def plan_tasks(spec, tables):
+    # Expands every job into independent tasks: one per table, or one per job
+    # when all its tables go into a single file.
+    tasks = []
+    for index, job in enumerate(spec["jobs"], 1):
+        file_format = job.get("format")
+        output = job.get("output")
+        single_file = job.get("single_file", False)
+        formats = SINGLE_FILE_FORMATS if single_file else TABLE_FORMATS
+        if file_format not in formats:
+            raise JobSpecError(f"Job {index}: unsupported format '{file_format}'")
+        if not output:
+            raise JobSpecError(f"Job {index}: 'output' is required")
+        options = job.get("options", {})
+
+        if job.get("query"):
+            # A query job exports one result set under the given name instead
+            # of matching tables.
+            if single_file:
+                raise JobSpecError(f"Job {index}: a query cannot be single_file")
+            name = job.get("name", "query_result")
+            tasks.append(
+                {
+                    "job": index,
+                    "format": file_format,
+                    "method": formats[file_format],
+                    "args": (name, output),
+                    "options": dict(options, query=job["query"]),
+                    "table": name,
+                    "output": output,
+                }
+            )
+            continue
+
+        job_tables = match_tables(job.get("tables", ["*"]), tables)
+        if not job_tables:
+            raise JobSpecError(f"Job {index}: no tables match {job.get('tables')}")
+
+        if single_file:
+            tasks.append(
+                {
+                    "job": index,
+                    "format": file_format,
+                    "method": formats[file_format],
+                    "args": (output, job_tables),
+                    "options": options,
+                    "table": None,
+                    "output": output,
+                }
+            )
+            continue
+
+        if len(job_tables) > 1 and "{table}" not in output:
+            raise JobSpecError(
+                f"Job {index}: 'output' needs a {{table}} placeholder when it "
+                "matches several tables"
+            )
+        for table in job_tables:
+            table_output = output.replace("{table}", table)
+            tasks.append(
+                {
+                    "job": index,
+                    "format": file_format,
+                    "method": formats[file_format],
+                    "args": (table, table_output),
+                    "options": options,
+                    "table": table,
+                    "output": table_output,
+                }
+            )
+    return tasks
+
+
+def run_task(export_manager, task, metrics_log=None):
+    output_dir = os.path.dirname(os.path.abspath(task["output"]))
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {
+        "job": task["job"],
+        "table": task["table"],
+        "format": task["format"],
+        "output": task["output"],
+    }
+    metrics = ExportMetrics(
+        callback=metrics_log,
+        context={"job": task["job"], "table": task["table"], "format": task["format"]},
+    )
+
+    def export(worker):
+        worker.metrics = metrics
+        return getattr(worker, task["method"])(*task["args"], **task["options"])
+
+    try:
+        result = export_manager.run_on_worker(export)
+        summary["status"] = "ok" if result is not False else "failed"
+        if result not in (True, False):
+            summary["result"] = result
+    except Exception as e:
+        summary["status"] = "failed"
+        summary["error"] = str(e)
+    summary["metrics"] = metrics.finish()
+    summary["seconds"] = summary["metrics"]["seconds"]
+    return summary
+
+
+def run_job_spec(spec, workers=None, metrics_log=None):
+    db_manager = DBManager(settings=spec.get("settings"))
+    db_manager.change_database(spec["database"])
+    export_manager = ExportManager(
+        spec["database"],
+        batch_size=spec.get("batch_size", ExportManager.DEFAULT_BATCH_SIZE),
+        rows_per_insert=spec.get("rows_per_insert", 1),
+        connection_manager=db_manager.connection_manager,
+    )
+    export_manager.INSTALL_SQLITE_EXTENSION = spec.get(
+        "install_sqlite_extension", False
+    )
+    try:
+        tasks = plan_tasks(spec, db_manager.get_tables())
+        workers = workers or spec.get("workers") or min(4, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    lambda task: run_task(export_manager, task, metrics_log), tasks
+                )
+            )
+    finally:
+        export_manager.close()
+        db_manager.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run DuckDB exports without the GUI from a JSON/YAML job spec."
+    )
+    parser.add_argument("job_spec", help="path to the JSON or YAML job spec")
+    parser.add_argument(
+        "--workers", type=int, help="number of exports to run concurrently"
+    )
+    parser.add_argument(
+        "--summary", help="write the JSON summary to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--metrics-log",
+        help="append phase and completion events as JSON lines to this file "
+        "('-' for stderr)",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    log_file = None
+    try:
+        metrics_log = None
+        if args.metrics_log == "-":
+            metrics_log = JsonLinesLog(sys.stderr)
+        elif args.metrics_log:
+            log_file = open(args.metrics_log, "a", encoding="utf-8")
+            metrics_log = JsonLinesLog(log_file)
+        spec = load_job_spec(args.job_spec)
+        results = run_job_spec(spec, args.workers, metrics_log)
+    except (OSError, ValueError, JobSpecError, duckdb.Error) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return EXIT_INVALID
+    finally:
+        if log_file:
+            log_file.close()
+
+    failed = [result for result in results if result["status"] != "ok"]
+    summary = {
+        "database": spec["database"],
+        "status": "failed" if failed else "ok",
+        "tasks": len(results),
+        "failed": len(failed),
+        "seconds": time.perf_counter() - started,
+        "results": results,
+    }
+    text = json.dumps(summary, indent=2, default=str)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for result in failed:
+        print(
+            f"Failed: job {result['job']} {result['table'] or ''} -> "
+            f"{result['output']}: {result.get('error', 'export returned False')}",
+            file=sys.stderr,
+        )
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
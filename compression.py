@@ -0,0 +1,101 @@
+import gzip
+import io
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+
+
+def compression_from_name(file_name):
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_name)[1].lower())
+
+
+def split_output_name(file_name):
+    # "dump.sql.gz" -> ("dump", ".sql.gz"), so derived file names such as pages
+    # or parts keep both the format and the compression extension.
+    base, extension = os.path.splitext(file_name)
+    if extension.lower() in COMPRESSION_EXTENSIONS:
+        base, inner_extension = os.path.splitext(base)
+        extension = inner_extension + extension
+    return base, extension
+
+
+def compress_bytes(data, compression, level=None):
+    # Concatenated gzip members and zstd frames are valid streams themselves,
+    # so separately compressed pieces can simply be written one after another.
+    level = level or DEFAULT_LEVELS[compression]
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=level)
+    _require_zstandard()
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package")
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, output_file, level=None, threads=DEFAULT_THREADS):
+        self.file = open(output_file, "wb")
+        self.level = level or DEFAULT_LEVELS["gzip"]
+        self.threads = max(1, threads)
+        self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        self.buffer = bytearray()
+        self.pending = deque()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= self.CHUNK_SIZE:
+            chunk = bytes(self.buffer[: self.CHUNK_SIZE])
+            del self.buffer[: self.CHUNK_SIZE]
+            self._submit(chunk)
+        return len(data)
+
+    def _submit(self, chunk):
+        # Each chunk becomes its own gzip member; zlib releases the GIL, so the
+        # members are compressed in parallel and written back in order.
+        self.pending.append(self.pool.submit(gzip.compress, chunk, self.level))
+        while len(self.pending) > self.threads * 2:
+            self.file.write(self.pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self.buffer or not self.pending:
+                self._submit(bytes(self.buffer))
+                self.buffer = bytearray()
+            while self.pending:
+                self.file.write(self.pending.popleft().result())
+        finally:
+            self.pool.shutdown()
+            self.file.close()
+            super().close()
+
+
+def open_compressed(output_file, compression, level=None, threads=DEFAULT_THREADS):
+    if compression == "gzip":
+        if threads > 1:
+            return ParallelGzipWriter(output_file, level, threads)
+        return gzip.open(output_file, "wb", compresslevel=level or 6)
+    if compression == "zstd":
+        _require_zstandard()
+        compressor = zstandard.ZstdCompressor(
+            level=level or DEFAULT_LEVELS["zstd"], threads=threads if threads > 1 else 0
+        )
+        return compressor.stream_writer(open(output_file, "wb"), closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
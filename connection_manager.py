@@ -0,0 +1,74 @@
+import os
+import threading
+
+import duckdb
+
+from ddl_generator import DDLGenerator
+from schema_cache import SchemaCache
+
+
+class ConnectionManager:
+    SETTINGS = ("threads", "memory_limit", "temp_directory")
+
+    def __init__(self, db_path, read_only=True, settings=None):
+        if not db_path or not os.path.exists(db_path):
+            raise ValueError("Invalid or unselected database path")
+        self.db_path = db_path
+        self.read_only = read_only
+        self._cursors = []
+        self._lock = threading.Lock()
+        # The file is opened once; every other user works on a cursor of this
+        # connection, so no second handle ever competes for the file lock.
+        self.conn = duckdb.connect(
+            db_path, read_only=read_only, config=self._config(settings)
+        )
+        # Table and column metadata is read once, in one catalog query, when the
+        # database is opened.
+        self.schema = SchemaCache(self.cursor())
+        self.schema.refresh()
+        self.ddl = DDLGenerator(self.cursor(), self.schema)
+
+    def refresh(self):
+        self.schema.refresh()
+        self.ddl.invalidate()
+
+    def _config(self, settings):
+        config = {}
+        for name, value in (settings or {}).items():
+            if name not in self.SETTINGS:
+                raise ValueError(f"Unsupported setting: {name}")
+            if value is not None:
+                config[name] = str(value)
+        return config
+
+    def cursor(self):
+        cursor = self.conn.cursor()
+        with self._lock:
+            self._cursors.append(cursor)
+        return cursor
+
+    def release(self, cursor):
+        with self._lock:
+            if cursor in self._cursors:
+                self._cursors.remove(cursor)
+        cursor.close()
+
+    def configure(self, **settings):
+        for name, value in self._config(settings).items():
+            escaped = value.replace("'", "''")
+            self.conn.execute(f"SET {name} = '{escaped}'")
+
+    def get_settings(self):
+        return {
+            name: self.conn.execute(f"SELECT current_setting('{name}')").fetchone()[0]
+            for name in self.SETTINGS
+        }
+
+    def close(self):
+        with self._lock:
+            cursors, self._cursors = self._cursors, []
+        for cursor in cursors:
+            cursor.close()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
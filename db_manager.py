@@ -1,40 +1,154 @@
-import duckdb
 import os
+import threading
+
+from connection_manager import ConnectionManager
+from table_profiler import profile_table
 
 
 class DBManager:
 
-    def __init__(self):
+    def __init__(self, settings=None):
         self.db_path = None
+        self.settings = settings
+        self.connection_manager = None
         self.conn = None
+        self.table_estimates = {}
+        self.row_count_cache = {}
+        self.row_counts_version = 0
+        self.profile_cache = {}
 
     def connect(self):
         if not self.db_path or not os.path.exists(self.db_path):
             raise ValueError("Invalid or unselected database path")
-        self.conn = duckdb.connect(self.db_path)
+        self.connection_manager = ConnectionManager(
+            self.db_path, settings=self.settings
+        )
+        self.conn = self.connection_manager.conn
 
     def change_database(self, new_db_path):
+        if self.connection_manager:
+            self.connection_manager.close()
+            self.connection_manager = None
+            self.conn = None
         self.db_path = new_db_path
-        if self.conn:
-            self.conn.close()
+        self.table_estimates = {}
         self.connect()
 
+    @property
+    def schema(self):
+        if not self.connection_manager:
+            self.connect()
+        return self.connection_manager.schema
+
+    def refresh_schema(self):
+        if not self.connection_manager:
+            self.connect()
+        self.connection_manager.refresh()
+        self.table_estimates = {}
+        self.row_count_cache = {}
+        self.profile_cache = {}
+
     def get_tables(self):
+        return self.schema.table_names()
+
+    def get_tables_with_estimates(self):
+        # Size estimates come from the schema cache instead of a COUNT(*) per
+        # table. Views have no estimate and are listed with None.
+        rows = [
+            (name, self.schema.get(name).estimated_size)
+            for name in self.schema.table_names()
+        ]
+        self.table_estimates = dict(rows)
+        return rows
+
+    def _row_counts(self):
+        # Exact counts are cached per database file; a new modification time
+        # means the data may have changed, so it starts a fresh cache.
+        key = (self.db_path, os.path.getmtime(self.db_path))
+        return self.row_count_cache.setdefault(key, {})
+
+    def get_row_count(self, table_name):
         if not self.conn:
             self.connect()
-        return [row[0] for row in self.conn.execute("SHOW TABLES").fetchall()]
+        row_counts = self._row_counts()
+        if table_name not in row_counts:
+            result = self.conn.execute(
+                "SELECT COUNT(*) FROM "
+                + self.connection_manager.ddl.identifier(table_name)
+            ).fetchone()
+            row_counts[table_name] = result[0] if result else 0
+        return row_counts[table_name]
 
-    def get_row_count(self, table_name):
+    def _profiles(self):
+        # Profiles are cached like exact row counts, per database file and
+        # modification time.
+        key = (self.db_path, os.path.getmtime(self.db_path))
+        return self.profile_cache.setdefault(key, {})
+
+    def get_table_profile(self, table_name, conn=None):
         if not self.conn:
             self.connect()
-        result = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()
-        return result[0] if result else 0
+        profiles = self._profiles()
+        if table_name not in profiles:
+            table = self.schema.get(table_name)
+            column_info = [(column.name, column.type) for column in table.columns]
+            profile = profile_table(
+                conn or self.conn,
+                table_name,
+                column_info,
+                self._row_counts().get(table_name, table.estimated_size),
+            )
+            profiles[table_name] = profile
+            # The scan counts every row, so the exact count comes for free.
+            self._row_counts()[table_name] = profile.rows
+            self.row_counts_version += 1
+        return profiles[table_name]
 
-    def get_table_schema(self, table_name):
+    def get_cached_row_count(self, table_name):
+        return self._row_counts().get(table_name)
+
+    def get_row_count_estimate(self, table_name):
+        count = self.get_cached_row_count(table_name)
+        if count is None:
+            count = self.table_estimates.get(table_name)
+        return count or 0
+
+    def count_rows_in_background(self, tables):
         if not self.conn:
             self.connect()
-        result = self.conn.execute(f"SHOW CREATE TABLE {table_name}").fetchall()
-        return result[0][0] if result else ""
+        row_counts = self._row_counts()
+        pending = [table for table in tables if table not in row_counts]
+        if not pending:
+            return
+        connection_manager = self.connection_manager
+        cursor = connection_manager.cursor()
+        db_path = self.db_path
+
+        def count_rows():
+            try:
+                for table_name in pending:
+                    # Stop quietly once another database has been opened.
+                    if self.db_path != db_path:
+                        break
+                    # One failing table must not leave the rest uncounted.
+                    try:
+                        result = cursor.execute(
+                            "SELECT COUNT(*) FROM "
+                            + connection_manager.ddl.identifier(table_name)
+                        ).fetchone()
+                    except Exception as e:
+                        print(f"Error counting rows of {table_name}: {str(e)}")
+                        continue
+                    row_counts[table_name] = result[0] if result else 0
+                    self.row_counts_version += 1
+            finally:
+                connection_manager.release(cursor)
+
+        threading.Thread(target=count_rows, daemon=True).start()
+
+    def get_table_schema(self, table_name):
+        table = self.schema.get(table_name)
+        return table.sql if table else ""
 
     def export_database_sql(self, export_path):
         if not self.conn:
@@ -49,8 +163,9 @@ class DBManager:
         self.conn.execute(f"EXPORT DATABASE '{new_path}' (FORMAT PARQUET)")
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        if self.connection_manager:
+            self.connection_manager.close()
+            self.connection_manager = None
             self.conn = None
             self.db_path = None
 
@@ -0,0 +1,237 @@
+import re
+import threading
+
+from sql_types import sqlite_type
+
+SIMPLE_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+LITERAL_DEFAULT = re.compile(
+    r"^(NULL|TRUE|FALSE|-?\d+(\.\d+)?|'([^']|'')*')$", re.IGNORECASE
+)
+SEQUENCE_DEFAULT = re.compile(r"nextval\('((?:[^']|'')+)'\)", re.IGNORECASE)
+
+
+class DDLGenerator:
+    # Constraints, indexes, sequences and views are each read in one bulk
+    # catalog query; columns come from the schema cache.
+    CONSTRAINTS_QUERY = """
+        SELECT table_name, constraint_type, constraint_text,
+               constraint_column_names, referenced_table
+        FROM duckdb_constraints()
+        WHERE database_name = current_database()
+          AND schema_name = current_schema()
+          AND constraint_type IN ('PRIMARY KEY', 'UNIQUE', 'CHECK', 'FOREIGN KEY')
+        ORDER BY table_name, constraint_index
+        """
+    INDEXES_QUERY = """
+        SELECT table_name, sql
+        FROM duckdb_indexes()
+        WHERE database_name = current_database()
+          AND schema_name = current_schema()
+          AND sql IS NOT NULL
+        ORDER BY table_name, index_name
+        """
+    SEQUENCES_QUERY = """
+        SELECT sequence_name, start_value, min_value, max_value, increment_by,
+               cycle, last_value
+        FROM duckdb_sequences()
+        WHERE database_name = current_database()
+          AND schema_name = current_schema()
+          AND NOT temporary
+        ORDER BY sequence_name
+        """
+    VIEWS_QUERY = """
+        SELECT view_name, sql
+        FROM duckdb_views()
+        WHERE database_name = current_database()
+          AND schema_name = current_schema()
+          AND NOT internal
+          AND NOT temporary
+        ORDER BY view_name
+        """
+    KEYWORDS_QUERY = (
+        "SELECT keyword_name FROM duckdb_keywords() WHERE keyword_category = 'reserved'"
+    )
+
+    def __init__(self, conn, schema):
+        self.conn = conn
+        self.schema = schema
+        self.catalog = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        constraints = {}
+        for table, kind, text, columns, referenced in self.conn.execute(
+            self.CONSTRAINTS_QUERY
+        ).fetchall():
+            constraints.setdefault(table, []).append((kind, text, columns, referenced))
+        indexes = {}
+        for table, sql in self.conn.execute(self.INDEXES_QUERY).fetchall():
+            indexes.setdefault(table, []).append(sql)
+        return {
+            "constraints": constraints,
+            "indexes": indexes,
+            "sequences": self.conn.execute(self.SEQUENCES_QUERY).fetchall(),
+            "views": dict(self.conn.execute(self.VIEWS_QUERY).fetchall()),
+            "reserved": {
+                row[0].lower()
+                for row in self.conn.execute(self.KEYWORDS_QUERY).fetchall()
+            },
+        }
+
+    def _get_catalog(self):
+        with self._lock:
+            if self.catalog is None:
+                self.catalog = self._load()
+            return self.catalog
+
+    def invalidate(self):
+        with self._lock:
+            self.catalog = None
+
+    def identifier(self, name):
+        # Only names that need it are quoted, so ordinary DDL stays readable.
+        if SIMPLE_IDENTIFIER.match(name) and (
+            name.lower() not in self._get_catalog()["reserved"]
+        ):
+            return name
+        return '"' + name.replace('"', '""') + '"'
+
+    def create_table(self, table_name, columns=None, portable=False):
+        table = self.schema.get(table_name)
+        if table is None:
+            raise ValueError(f"Table '{table_name}' does not exist in the database")
+        table_columns = table.columns
+        if columns:
+            by_name = {column.name: column for column in table_columns}
+            missing = [column for column in columns if column not in by_name]
+            if missing:
+                raise ValueError(
+                    f"Columns {missing} do not exist in table '{table_name}'"
+                )
+            table_columns = [by_name[column] for column in columns]
+        selected = {column.name for column in table_columns}
+
+        definitions = []
+        for column in table_columns:
+            col_type = sqlite_type(column.type) if portable else column.type
+            definition = f"{self.identifier(column.name)} {col_type}"
+            if column.not_null:
+                definition += " NOT NULL"
+            # Portable DDL (SQLite) uses SQLite's types and keeps only constant
+            # defaults.
+            if column.default is not None and (
+                not portable or LITERAL_DEFAULT.match(column.default)
+            ):
+                definition += f" DEFAULT {column.default}"
+            definitions.append(definition)
+
+        for kind, text, constraint_columns, _ in self._get_catalog()["constraints"].get(
+            table_name, []
+        ):
+            # A projection only keeps constraints whose columns all survive it,
+            # and CHECK expressions may use functions other databases lack.
+            if not set(constraint_columns) <= selected:
+                continue
+            if portable and kind == "CHECK":
+                continue
+            definitions.append(text)
+
+        return "CREATE TABLE {} (\n    {}\n);".format(
+            self.identifier(table_name), ",\n    ".join(definitions)
+        )
+
+    def create_indexes(self, table_name):
+        return list(self._get_catalog()["indexes"].get(table_name, []))
+
+    def sequence_names(self, table_names=None, columns=None):
+        sequences = [row[0] for row in self._get_catalog()["sequences"]]
+        if table_names is None:
+            return sequences
+        # Only the sequences used by the tables' column defaults, optionally
+        # restricted to a projection's columns.
+        used = set()
+        for table_name in table_names:
+            table = self.schema.get(table_name)
+            for column in table.columns if table else []:
+                if columns and column.name not in columns:
+                    continue
+                for name in SEQUENCE_DEFAULT.findall(column.default or ""):
+                    used.add(name.replace("''", "'"))
+        return [name for name in sequences if name in used]
+
+    def create_sequences(self, names):
+        statements = []
+        for (
+            name,
+            start,
+            minimum,
+            maximum,
+            increment,
+            cycle,
+            last,
+        ) in self._get_catalog()["sequences"]:
+            if name not in names:
+                continue
+            # A sequence that has been used continues after its last value.
+            if last is not None:
+                start = last + increment
+            statements.append(
+                f"CREATE SEQUENCE {self.identifier(name)} INCREMENT BY {increment} "
+                f"MINVALUE {minimum} MAXVALUE {maximum} START {start} "
+                f"{'CYCLE' if cycle else 'NO CYCLE'};"
+            )
+        return statements
+
+    def view_names(self):
+        return list(self._get_catalog()["views"])
+
+    def create_view(self, view_name):
+        return self._get_catalog()["views"][view_name]
+
+    def _dependency_order(self, names, dependencies):
+        # Stable topological order; anything left in a cycle keeps its
+        # original position at the end.
+        ordered = []
+        remaining = list(names)
+        while remaining:
+            ready = [
+                name
+                for name in remaining
+                if not (dependencies.get(name, set()) & (set(remaining) - {name}))
+            ]
+            if not ready:
+                ordered.extend(remaining)
+                break
+            ordered.extend(ready)
+            remaining = [name for name in remaining if name not in ready]
+        return ordered
+
+    def references(self, table_name):
+        return {
+            referenced
+            for kind, _, _, referenced in self._get_catalog()["constraints"].get(
+                table_name, []
+            )
+            if kind == "FOREIGN KEY" and referenced and referenced != table_name
+        }
+
+    def order_tables(self, table_names):
+        dependencies = {name: self.references(name) for name in table_names}
+        return self._dependency_order(table_names, dependencies)
+
+    def order_views(self, view_names):
+        views = self._get_catalog()["views"]
+        dependencies = {
+            name: {
+                other
+                for other in view_names
+                if other != name
+                and re.search(
+                    r"(?<![\w\"])\"?" + re.escape(other) + r"\"?(?![\w\"])",
+                    views[name],
+                    re.IGNORECASE,
+                )
+            }
+            for name in view_names
+        }
+        return self._dependency_order(view_names, dependencies)
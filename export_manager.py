@@ -1,20 +1,434 @@
-import duckdb
+import contextlib
+import copy
+import io
+import itertools
+import json
+import os
+import re
+import shutil
 import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from checkpoint import ExportCheckpoint
+from compression import (
+    DEFAULT_THREADS,
+    compress_bytes,
+    compression_from_name,
+    open_compressed,
+    split_output_name,
+)
+from connection_manager import ConnectionManager
+from snapshot import (
+    DEFAULT_FORMAT,
+    MANIFEST_NAME,
+    PARQUET_TEXT_TYPES,
+    POST_LOAD_NAME,
+    SCHEMA_NAME,
+    SNAPSHOT_FORMATS,
+    file_checksum,
+)
+from sql_types import (
+    literal_expr,
+    quote_identifier,
+    quote_literal,
+    sqlite_type,
+    sqlite_value_expr,
+)
+
+
+class ExportCancelled(Exception):
+    pass
 
 
 class ExportManager:
+    DEFAULT_BATCH_SIZE = 10000
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    COMPRESSION_THREADS = DEFAULT_THREADS
+
+    INCREMENTAL_FORMATS = {
+        "csv": "FORMAT CSV, HEADER",
+        "parquet": "FORMAT PARQUET",
+    }
+    STATE_FILE_NAME = "export_state.json"
+    # Incremental exports running in parallel may share one state file.
+    _state_locks = {}
+    _state_locks_lock = threading.Lock()
+    PART_COLUMN = "__export_part"
+    HTML_ESCAPES = (
+        ("&", "&amp;"),
+        ("<", "&lt;"),
+        (">", "&gt;"),
+        ('"', "&quot;"),
+        ("'", "&#39;"),
+    )
+    ESTIMATE_SAMPLE_ROWS = 10000
+    ESTIMATE_FORMATS = {
+        "sql": ("export_table_sql", ".sql"),
+        "csv": ("export_table_csv", ".csv"),
+        "json": ("export_table_json", ".json"),
+        "parquet": ("export_table_parquet", ".parquet"),
+        "html": ("export_table_html", ".html"),
+        "xml": ("export_table_xml", ".xml"),
+        "sqlite": ("export_table_sqlite", ".db"),
+    }
+    USE_SQLITE_EXTENSION = True
+    # Installing downloads the extension, so it only happens when asked for;
+    # otherwise an extension that is already installed is loaded.
+    INSTALL_SQLITE_EXTENSION = False
+    SQLITE_EXTENSION_QUERY = """
+        SELECT installed, loaded FROM duckdb_extensions()
+        WHERE extension_name = 'sqlite_scanner'
+        """
+    # Workers share one DuckDB instance, so every attached file needs its own
+    # alias.
+    _sqlite_aliases = itertools.count()
+    SQLITE_PAGE_SIZE = 65536
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=OFF",
+        "PRAGMA synchronous=OFF",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-262144",
+    )
+    # A resumable SQLite export commits every batch, so the journal has to
+    # survive a crash.
+    SQLITE_CHECKPOINT_PRAGMAS = (
+        "PRAGMA journal_mode=DELETE",
+        "PRAGMA synchronous=NORMAL",
+    )
+    SQLITE_CHECKPOINT_ROWS = 1000000
 
-    def __init__(self, db_path):
+    def __init__(
+        self,
+        db_path,
+        batch_size=DEFAULT_BATCH_SIZE,
+        rows_per_insert=1,
+        connection_manager=None,
+    ):
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path)
+        self.batch_size = batch_size
+        self.rows_per_insert = rows_per_insert
+        self.metrics = None
+        self.cancel_event = None
+        self._worker_conns = set()
+        self._worker_lock = threading.Lock()
+        self._sqlite_extension = None
+        # Exports only read the database, so a manager shared with the rest of
+        # the application is preferred over opening the file a second time.
+        self._owns_connection_manager = connection_manager is None
+        self.connection_manager = connection_manager or ConnectionManager(db_path)
+        self.conn = self.connection_manager.cursor()
+
+    def interrupt(self):
+        if self.conn:
+            self.conn.interrupt()
+        with self._worker_lock:
+            for conn in self._worker_conns:
+                conn.interrupt()
+
+    def run_on_worker(self, func, *args):
+        # Each worker gets a shallow copy of this manager bound to its own DuckDB
+        # cursor, so tables can be scanned concurrently on one database instance.
+        worker = copy.copy(self)
+        worker._owns_connection_manager = False
+        worker.conn = self.connection_manager.cursor()
+        with self._worker_lock:
+            self._worker_conns.add(worker.conn)
+        try:
+            return func(worker, *args)
+        finally:
+            with self._worker_lock:
+                self._worker_conns.discard(worker.conn)
+            self.connection_manager.release(worker.conn)
+            worker.conn = None
+
+    def _check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExportCancelled()
+
+    def _phase(self, name):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.phase(name)
+
+    def _report_progress(self, rows):
+        if self.metrics is not None:
+            self.metrics.add_rows(rows)
+
+    def _record_output(self, output_file):
+        if self.metrics is not None:
+            self.metrics.add_output(output_file)
+
+    def _open_output(self, output_file, compression=None):
+        # Without an explicit choice a .gz or .zst file name selects the codec.
+        compression = compression or compression_from_name(output_file)
+        self._record_output(output_file)
+        if compression:
+            return io.TextIOWrapper(
+                io.BufferedWriter(
+                    open_compressed(
+                        output_file, compression, threads=self.COMPRESSION_THREADS
+                    ),
+                    self.WRITE_BUFFER_SIZE,
+                ),
+                encoding="utf-8",
+            )
+        return open(
+            output_file, "w", encoding="utf-8", buffering=self.WRITE_BUFFER_SIZE
+        )
+
+    def _copy_compression_option(self, compression):
+        if not compression:
+            return []
+        return [f"COMPRESSION {self._escape_value(compression)}"]
+
+    def _iter_batches(self, query, batch_size=None):
+        # Rows are pulled in fixed-size chunks so memory stays flat however large
+        # the table is. The result is bound to self.conn, so callers must not run
+        # other statements on it until the generator is exhausted.
+        with self._phase("query"):
+            result = self.conn.execute(query)
+        while True:
+            self._check_cancelled()
+            with self._phase("fetch"):
+                rows = result.fetchmany(batch_size or self.batch_size)
+            if not rows:
+                break
+            yield rows
+            self._report_progress(len(rows))
+
+    def _write_rendered(self, f, rows):
+        with self._phase("render"):
+            text = "".join(row[0] for row in rows)
+        with self._phase("write"):
+            f.write(text)
+
+    def _iter_arrow_batches(self, query, batch_size=None):
+        with self._phase("query"):
+            result = self.conn.execute(query)
+            # fetch_record_batch() is deprecated in newer DuckDB releases.
+            to_reader = getattr(result, "to_arrow_reader", None)
+            if to_reader is None:
+                to_reader = result.fetch_record_batch
+            reader = to_reader(batch_size or self.batch_size)
+        while True:
+            self._check_cancelled()
+            with self._phase("fetch"):
+                try:
+                    batch = reader.read_next_batch()
+                except StopIteration:
+                    break
+            if batch.num_rows:
+                yield batch
+                self._report_progress(batch.num_rows)
+
+    def _arrow_text(self, column):
+        # The data buffer of an Arrow string column holds every value back to
+        # back, so a column of rendered rows already is the text to write.
+        if column.null_count == 0 and (
+            pyarrow.types.is_string(column.type)
+            or pyarrow.types.is_large_string(column.type)
+        ):
+            _, offsets, data = column.buffers()
+            width = 8 if pyarrow.types.is_large_string(column.type) else 4
+
+            def offset(index):
+                position = (column.offset + index) * width
+                return int.from_bytes(
+                    offsets[position : position + width], sys.byteorder, signed=True
+                )
+
+            return memoryview(data)[offset(0) : offset(len(column))]
+        return "".join(column.to_pylist()).encode("utf-8")
+
+    def _write_rendered_query(self, f, query):
+        # Writes every row of a query that renders one text column per row.
+        # With pyarrow, batches go from DuckDB to the file as raw bytes, without
+        # a Python object per row; otherwise rows are fetched as tuples.
+        row_count = 0
+        if pyarrow is None or not hasattr(f, "buffer"):
+            for rows in self._iter_batches(query):
+                self._write_rendered(f, rows)
+                row_count += len(rows)
+            return row_count
+        f.flush()
+        for batch in self._iter_arrow_batches(query):
+            with self._phase("render"):
+                data = self._arrow_text(batch.column(0))
+            with self._phase("write"):
+                f.buffer.write(data)
+            row_count += batch.num_rows
+        return row_count
+
+    def _get_table_schema(self, table_name):
+        table = self.connection_manager.schema.get(table_name)
+        if table is None:
+            raise ValueError(f"Table '{table_name}' does not exist in the database")
+        return table
+
+    def _get_column_info(self, table_name):
+        return [
+            (column.name, column.type)
+            for column in self._get_table_schema(table_name).columns
+        ]
+
+    def _get_columns(self, table_name):
+        return [name for name, _ in self._get_column_info(table_name)]
+
+    def _source_query(self, table_name, columns=None, where=None, query=None):
+        # Projections and filters are pushed into the statement DuckDB runs, so
+        # only the requested columns and rows are ever scanned.
+        if query:
+            if columns or where:
+                raise ValueError("query cannot be combined with columns or where")
+            return query.strip().rstrip(";")
+        projection = "*"
+        if columns:
+            projection = ", ".join(quote_identifier(c) for c in columns)
+        source = f"SELECT {projection} FROM {self._sql_name(table_name)}"
+        if where:
+            source += f" WHERE {where}"
+        return source
+
+    def _get_source_column_info(self, source):
+        with self._phase("schema"):
+            result = self.conn.execute(f"DESCRIBE {source}").fetchall()
+        return [(row[0], row[1]) for row in result]
+
+    def _get_export_column_info(self, table_name, columns=None, query=None):
+        # Tables and projections are answered from the schema cache; only a
+        # query result has to be described by DuckDB.
+        if query:
+            return self._get_source_column_info(
+                self._source_query(table_name, query=query)
+            )
+        column_info = self._get_column_info(table_name)
+        if not columns:
+            return column_info
+        types = dict(column_info)
+        missing = [column for column in columns if column not in types]
+        if missing:
+            raise ValueError(f"Columns {missing} do not exist in table '{table_name}'")
+        return [(column, types[column]) for column in columns]
+
+    def _sql_name(self, name):
+        return self.connection_manager.ddl.identifier(name)
+
+    def _sql_literal_expr(self, column, col_type):
+        # Renders one column as SQL literal text inside DuckDB, so escaping runs
+        # vectorized over whole columns instead of once per cell in Python.
+        return literal_expr(quote_identifier(column), col_type)
+
+    def _sql_values_query(self, source, column_info, key=None):
+        literals = ", ".join(
+            self._sql_literal_expr(column, col_type) for column, col_type in column_info
+        )
+        # A resumable export also needs the key of every row it writes.
+        key_column = ""
+        if key:
+            key_column = f", CAST({quote_identifier(key)} AS VARCHAR)"
+        return (
+            f"SELECT '(' || concat_ws(', ', {literals}) || ')'{key_column} "
+            f"FROM ({source}) AS src"
+        )
+
+    def _resume_key(self, table_name, column_info, query):
+        if query:
+            return None
+        keys = [
+            column.name
+            for column in self._get_table_schema(table_name).columns
+            if column.primary_key
+        ]
+        if len(keys) == 1 and keys[0] in dict(column_info):
+            return keys[0]
+        return None
+
+    def _resume_source(
+        self,
+        table_name,
+        source,
+        column_info,
+        query,
+        offset=0,
+        last_key=None,
+        limit=None,
+    ):
+        # Rows are read in primary key order when the export has a single-column
+        # key, so committed rows can be skipped by key; otherwise they are
+        # skipped by offset, relying on DuckDB keeping the order of a scan
+        # (preserve_insertion_order, on by default).
+        key = self._resume_key(table_name, column_info, query)
+        suffix = ""
+        if key:
+            column = quote_identifier(key)
+            if last_key is not None:
+                suffix += (
+                    f" WHERE {column} > CAST({self._escape_value(last_key)} "
+                    f"AS {dict(column_info)[key]})"
+                )
+            suffix += f" ORDER BY {column}"
+        if limit:
+            suffix += f" LIMIT {int(limit)}"
+        if offset:
+            suffix += f" OFFSET {int(offset)}"
+        if suffix:
+            source = f"SELECT * FROM ({source}) AS src{suffix}"
+        return source, key
+
+    def _write_table_inserts(
+        self, f, table_name, source, column_info, progress=None, key=None
+    ):
+        columns = ", ".join(self._sql_name(column) for column, _ in column_info)
+        prefix = f"INSERT INTO {self._sql_name(table_name)} ({columns}) VALUES "
+        per_insert = max(1, self.rows_per_insert)
+        # Fetch whole multiples of rows_per_insert so no statement straddles two
+        # batches.
+        fetch_size = per_insert * max(1, self.batch_size // per_insert)
+        query = self._sql_values_query(source, column_info, key)
+        if per_insert == 1 and progress is None:
+            # Whole statements are rendered by DuckDB.
+            return self._write_rendered_query(
+                f,
+                f"SELECT {self._escape_value(prefix)} || values_row || ';' || chr(10) "
+                f"FROM ({query}) AS src(values_row)",
+            )
+        row_count = 0
+        for rows in self._iter_batches(query, fetch_size):
+            row_count += len(rows)
+            with self._phase("render"):
+                if per_insert == 1:
+                    text = "".join(prefix + row[0] + ";\n" for row in rows)
+                else:
+                    text = "".join(
+                        prefix
+                        + ",\n".join(row[0] for row in rows[i : i + per_insert])
+                        + ";\n"
+                        for i in range(0, len(rows), per_insert)
+                    )
+            with self._phase("write"):
+                f.write(text)
+            if progress is not None:
+                # f is an ExportCheckpoint; every batch is one committed chunk.
+                progress["rows"] += len(rows)
+                if key:
+                    progress["key"] = rows[-1][1]
+                with self._phase("write"):
+                    f.commit()
+        return row_count
 
     def _escape_value(self, value):
-        if value is None:
-            return "NULL"
-        if isinstance(value, str):
-            escaped_value = value.replace("'", "''")
-            return "'" + escaped_value + "'"
-        return str(value)
+        return quote_literal(value)
 
     def _escape_html(self, value):
         if value is None:
@@ -28,127 +442,1053 @@ class ExportManager:
             .replace("'", "&#39;")
         )
 
-    def get_create_table_sql(self, table_name):
-        result = self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-        if not result:
-            raise ValueError(f"Table '{table_name}' does not exist in the database")
-        columns = []
-        for row in result:
-            col_name, col_type, not_null, default = row[1], row[2], bool(row[3]), row[4]
-            not_null_clause = "NOT NULL" if not_null else ""
-            default_clause = (
-                f"DEFAULT {self._escape_value(default)}" if default is not None else ""
-            )
-            col_definition = (
-                f"{col_name} {col_type} {not_null_clause} {default_clause}".strip()
+    def get_create_table_sql(
+        self, table_name, columns=None, query=None, portable=False
+    ):
+        if query:
+            # A query result has no constraints to carry over, only names and
+            # types.
+            definitions = [
+                f"{self._sql_name(name)} "
+                f"{sqlite_type(col_type) if portable else col_type}"
+                for name, col_type in self._get_export_column_info(
+                    table_name, query=query
+                )
+            ]
+            return "CREATE TABLE {} (\n    {}\n);".format(
+                self._sql_name(table_name), ",\n    ".join(definitions)
             )
-            columns.append(col_definition)
+        return self.connection_manager.ddl.create_table(table_name, columns, portable)
 
-        return "CREATE TABLE {} (\n    {}\n);".format(
-            table_name, ",\n    ".join(columns)
-        )
+    def _get_table_ddl(self, table_name, columns=None, query=None):
+        # Sequences used by column defaults come first and indexes last; a
+        # projection or query result may lack the indexed columns, so only
+        # whole tables get their indexes. A query result has no defaults.
+        schema = self.get_create_table_sql(table_name, columns, query)
+        if query:
+            return [], schema, []
+        ddl = self.connection_manager.ddl
+        sequences = ddl.create_sequences(ddl.sequence_names([table_name], columns))
+        if columns:
+            return sequences, schema, []
+        return sequences, schema, ddl.create_indexes(table_name)
 
-    def export_table_structure_only(self, table_name, output_file):
-        schema = self.get_create_table_sql(table_name)
-        with open(output_file, "w", encoding="utf-8") as f:
+    def export_table_structure_only(
+        self, table_name, output_file, columns=None, query=None, compression=None
+    ):
+        sequences, schema, indexes = self._get_table_ddl(table_name, columns, query)
+        with self._open_output(output_file, compression) as f:
+            f.write("".join(statement + "\n" for statement in sequences))
             f.write(schema + "\n")
+            f.write("".join(statement + "\n" for statement in indexes))
         return True
 
-    def export_table_sql(self, table_name, output_file):
-        schema = self.get_create_table_sql(table_name)
-        data = self.conn.execute(f"SELECT * FROM {table_name}").fetchall()
-        columns = [
-            row[1]
-            for row in self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-        ]
-
-        with open(output_file, "w", encoding="utf-8") as f:
+    def export_table_sql(
+        self,
+        table_name,
+        output_file,
+        columns=None,
+        where=None,
+        query=None,
+        compression=None,
+        resumable=False,
+    ):
+        sequences, schema, indexes = self._get_table_ddl(table_name, columns, query)
+        source = self._source_query(table_name, columns, where, query)
+        column_info = self._get_export_column_info(table_name, columns, query)
+        if resumable:
+            self._write_sql_checkpointed(
+                output_file,
+                {"tables": [table_name], "columns": columns, "where": where},
+                compression,
+                "".join(statement + "\n" for statement in sequences),
+                [(table_name, schema, source, column_info, query)],
+                "".join(statement + "\n" for statement in indexes),
+            )
+            return True
+        with self._open_output(output_file, compression) as f:
+            f.write("".join(statement + "\n" for statement in sequences))
             f.write(schema + "\n\n")
-            for row in data:
-                values = ", ".join(self._escape_value(v) for v in row)
-                f.write(
-                    f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({values});\n"
-                )
+            self._write_table_inserts(f, table_name, source, column_info)
+            # Indexes are created after the data so a restore loads at bulk
+            # speed.
+            if indexes:
+                f.write("\n" + "".join(statement + "\n" for statement in indexes))
         return True
 
-    def export_table_csv(self, table_name, output_file):
-        self.conn.execute(f"COPY {table_name} TO '{output_file}' (FORMAT CSV, HEADER)")
+    def _write_table_sql_section(self, f, table_name):
+        f.write(self.get_create_table_sql(table_name) + "\n\n")
+        return self._write_table_inserts(
+            f,
+            table_name,
+            self._source_query(table_name),
+            self._get_column_info(table_name),
+        )
+
+    def _write_sql_checkpointed(
+        self, output_file, settings, compression, header, sections, footer
+    ):
+        compression = compression or compression_from_name(output_file)
+        checkpoint = ExportCheckpoint(
+            output_file,
+            dict(
+                settings,
+                format="sql",
+                database=os.path.abspath(self.db_path),
+                query=[section[4] for section in sections],
+                rows_per_insert=self.rows_per_insert,
+                compression=compression,
+            ),
+        )
+        self._record_output(output_file)
+        results = []
+        checkpoint.open_stream(compression)
+        try:
+            if not checkpoint.state["bytes"]:
+                checkpoint.write(header)
+            for table_name, schema, source, column_info, query in sections:
+                self._check_cancelled()
+                started = time.perf_counter()
+                progress = checkpoint.progress(table_name)
+                if progress is None:
+                    progress = checkpoint.start_table(table_name)
+                    checkpoint.write(schema + "\n\n")
+                    checkpoint.commit()
+                if not progress["done"]:
+                    source, key = self._resume_source(
+                        table_name,
+                        source,
+                        column_info,
+                        query,
+                        progress["rows"] if progress["key"] is None else 0,
+                        progress["key"],
+                    )
+                    self._write_table_inserts(
+                        checkpoint, table_name, source, column_info, progress, key
+                    )
+                    progress["done"] = True
+                    checkpoint.commit()
+                results.append(
+                    self._table_result(
+                        table_name, progress["rows"], started, output_file
+                    )
+                )
+            if not checkpoint.state["complete"]:
+                if footer:
+                    checkpoint.write("\n" + footer)
+                checkpoint.state["complete"] = True
+                checkpoint.commit()
+        finally:
+            checkpoint.close()
+        checkpoint.finish()
+        return results
+
+    def _get_dump_objects(self, tables=None):
+        # Splits the export into tables in dependency order, the sequence DDL
+        # they need and the DDL that follows the data (indexes, then views).
+        # Without a table list the whole database is exported.
+        ddl = self.connection_manager.ddl
+        if tables is None:
+            tables = self.connection_manager.schema.table_names("table")
+            views = ddl.view_names()
+            sequences = ddl.sequence_names()
+        else:
+            views = [name for name in tables if name in ddl.view_names()]
+            tables = [name for name in tables if name not in views]
+            sequences = ddl.sequence_names(tables)
+        tables = ddl.order_tables(tables)
+        post_load = [s for table_name in tables for s in ddl.create_indexes(table_name)]
+        post_load += [ddl.create_view(name) for name in ddl.order_views(views)]
+        return tables, ddl.create_sequences(sequences), post_load
+
+    def _get_table_names(self):
+        return self.connection_manager.schema.table_names()
+
+    def _part_file_name(self, index, table_name, extension):
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", table_name)
+        return f"{index:04d}_{safe_name}{extension}"
+
+    def _table_result(self, table_name, rows, started, output_file):
+        seconds = time.perf_counter() - started
+        return {
+            "table": table_name,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds > 0 else 0.0,
+            "file": output_file,
+        }
+
+    def _export_table_part(self, write_section, table_name, part_file, compression):
+        started = time.perf_counter()
+        with self._open_output(part_file, compression) as f:
+            rows = write_section(self, f, table_name)
+        return self._table_result(table_name, rows, started, part_file)
+
+    def _export_all_tables(
+        self,
+        output_file,
+        tables,
+        write_section,
+        header,
+        footer,
+        workers,
+        concatenate,
+        compression,
+    ):
+        if tables is None:
+            tables = self._get_table_names()
+        compression = compression or compression_from_name(output_file)
+
+        if workers <= 1 and concatenate:
+            results = []
+            with self._open_output(output_file, compression) as f:
+                f.write(header)
+                for table_name in tables:
+                    started = time.perf_counter()
+                    rows = write_section(self, f, table_name)
+                    results.append(
+                        self._table_result(table_name, rows, started, output_file)
+                    )
+                f.write(footer)
+            return results
+
+        base, extension = split_output_name(output_file)
+        parts_dir = base + "_parts"
+        os.makedirs(parts_dir, exist_ok=True)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [
+                    pool.submit(
+                        self.run_on_worker,
+                        ExportManager._export_table_part,
+                        write_section,
+                        table_name,
+                        os.path.join(
+                            parts_dir, self._part_file_name(i, table_name, extension)
+                        ),
+                        compression,
+                    )
+                    for i, table_name in enumerate(tables, 1)
+                ]
+                # Results keep the table order regardless of completion order,
+                # which is also the order the parts are concatenated in.
+                results = [future.result() for future in futures]
+        except BaseException:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+            raise
+
+        if concatenate:
+            # Compressed parts are complete gzip members or zstd frames, so they
+            # are concatenated as they are.
+            header = header.encode("utf-8")
+            footer = footer.encode("utf-8")
+            if compression:
+                header = compress_bytes(header, compression)
+                footer = compress_bytes(footer, compression)
+            self._record_output(output_file)
+            with self._phase("write"), open(output_file, "wb") as out:
+                out.write(header)
+                for result in results:
+                    with open(result["file"], "rb") as part:
+                        shutil.copyfileobj(part, out, self.WRITE_BUFFER_SIZE)
+                    result["file"] = output_file
+                out.write(footer)
+            shutil.rmtree(parts_dir)
+        return results
+
+    def export_all_tables_sql(
+        self,
+        output_file,
+        tables=None,
+        workers=1,
+        concatenate=True,
+        compression=None,
+        resumable=False,
+    ):
+        # Sequences, then tables (referenced tables before the tables that
+        # reference them) with their data, then indexes, then views.
+        tables, sequences, footer = self._get_dump_objects(tables)
+        header = "".join(s + "\n" for s in sequences)
+        if header:
+            header += "\n"
+        if resumable:
+            # A resumable dump is written table by table into a single file.
+            return self._write_sql_checkpointed(
+                output_file,
+                {"tables": tables, "post_load": footer},
+                compression,
+                header,
+                [
+                    (
+                        table_name,
+                        self.get_create_table_sql(table_name),
+                        self._source_query(table_name),
+                        self._get_column_info(table_name),
+                        None,
+                    )
+                    for table_name in tables
+                ],
+                "".join(s + "\n" for s in footer),
+            )
+        footer = "".join("\n" + s for s in footer) + ("\n" if footer else "")
+        return self._export_all_tables(
+            output_file,
+            tables,
+            ExportManager._write_table_sql_section,
+            header,
+            footer,
+            workers,
+            concatenate,
+            compression,
+        )
+
+    def _copy_rolled(
+        self,
+        query,
+        output_file,
+        options,
+        partition_by=None,
+        max_file_size=None,
+        max_rows_per_file=None,
+        overwrite=False,
+    ):
+        options = list(options)
+        partition_by = list(partition_by or [])
+        if max_file_size and (partition_by or max_rows_per_file):
+            raise ValueError(
+                "max_file_size cannot be combined with partition_by or "
+                "max_rows_per_file"
+            )
+        if max_file_size:
+            if isinstance(max_file_size, str):
+                max_file_size = self._escape_value(max_file_size)
+            options.append(f"FILE_SIZE_BYTES {max_file_size}")
+        if max_rows_per_file:
+            # DuckDB has no row limit per file, so rows are numbered into
+            # fixed-size chunks that become one extra (temporary) partition level.
+            window = ""
+            if partition_by:
+                window = "PARTITION BY " + ", ".join(
+                    quote_identifier(column) for column in partition_by
+                )
+            query = (
+                f"SELECT *, (row_number() OVER ({window}) - 1) "
+                f"// {int(max_rows_per_file)} AS {self.PART_COLUMN} FROM ({query})"
+            )
+            partition_by.append(self.PART_COLUMN)
+        if partition_by:
+            options.append(
+                "PARTITION_BY ("
+                + ", ".join(quote_identifier(column) for column in partition_by)
+                + ")"
+            )
+        # Rolled and partitioned output goes into a directory, which DuckDB
+        # only writes into when it is empty unless told to replace it.
+        if overwrite and (partition_by or max_file_size):
+            options.append("OVERWRITE")
+        rows = self._copy_query(query, output_file, ", ".join(options))
+        if max_rows_per_file:
+            self._flatten_part_directories(output_file)
+        return rows
+
+    def _flatten_part_directories(self, output_dir):
+        # Turns <dir>/__export_part=N/data_0.ext into <dir>/data_N.ext.
+        prefix = self.PART_COLUMN + "="
+        for root, dirs, _ in os.walk(output_dir):
+            for name in dirs:
+                if not name.startswith(prefix):
+                    continue
+                part_dir = os.path.join(root, name)
+                part = name[len(prefix) :]
+                files = sorted(os.listdir(part_dir))
+                for i, file_name in enumerate(files):
+                    extension = os.path.splitext(file_name)[1]
+                    suffix = f"_{i}" if len(files) > 1 else ""
+                    os.replace(
+                        os.path.join(part_dir, file_name),
+                        os.path.join(root, f"data_{part}{suffix}{extension}"),
+                    )
+                os.rmdir(part_dir)
+
+    def export_table_csv(
+        self,
+        table_name,
+        output_file,
+        partition_by=None,
+        max_file_size=None,
+        max_rows_per_file=None,
+        compression=None,
+        columns=None,
+        where=None,
+        query=None,
+        overwrite=False,
+    ):
+        options = ["FORMAT CSV", "HEADER"] + self._copy_compression_option(compression)
+        self._copy_rolled(
+            self._source_query(table_name, columns, where, query),
+            output_file,
+            options,
+            partition_by,
+            max_file_size,
+            max_rows_per_file,
+            overwrite,
+        )
         return True
 
-    def export_table_json(self, table_name, output_file):
-        self.conn.execute(f"COPY {table_name} TO '{output_file}' (FORMAT JSON)")
+    def export_table_json(
+        self,
+        table_name,
+        output_file,
+        columns=None,
+        where=None,
+        query=None,
+        compression=None,
+    ):
+        self._copy_query(
+            self._source_query(table_name, columns, where, query),
+            output_file,
+            ", ".join(["FORMAT JSON"] + self._copy_compression_option(compression)),
+        )
         return True
 
-    def export_table_parquet(self, table_name, output_file):
-        self.conn.execute(f"COPY {table_name} TO '{output_file}' (FORMAT PARQUET)")
+    def export_table_parquet(
+        self,
+        table_name,
+        output_file,
+        partition_by=None,
+        max_file_size=None,
+        max_rows_per_file=None,
+        row_group_size=None,
+        compression=None,
+        columns=None,
+        where=None,
+        query=None,
+        overwrite=False,
+    ):
+        options = ["FORMAT PARQUET"] + self._copy_compression_option(compression)
+        if row_group_size:
+            options.append(f"ROW_GROUP_SIZE {int(row_group_size)}")
+        self._copy_rolled(
+            self._source_query(table_name, columns, where, query),
+            output_file,
+            options,
+            partition_by,
+            max_file_size,
+            max_rows_per_file,
+            overwrite,
+        )
         return True
 
-    def export_table_html(self, table_name, output_file):
-        data = self.conn.execute(f"SELECT * FROM {table_name}").fetchall()
-        columns = [
-            row[1]
-            for row in self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-        ]
+    def _load_state(self, state_file):
+        if not os.path.exists(state_file):
+            return {}
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("<!DOCTYPE html>\n<html>\n<head>\n")
-            f.write("<title>Table Export</title>\n")
-            f.write("<style>\n")
-            f.write("table { border-collapse: collapse; width: 100%; }\n")
-            f.write(
-                "th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n"
-            )
-            f.write("th { background-color: #f2f2f2; }\n")
-            f.write("tr:nth-child(even) { background-color: #f9f9f9; }\n")
-            f.write("</style>\n")
-            f.write("</head>\n<body>\n")
-            f.write(f"<h2>Table: {table_name}</h2>\n")
-            f.write("<table>\n")
+    def _state_lock(self, state_file):
+        with self._state_locks_lock:
+            return self._state_locks.setdefault(
+                os.path.abspath(state_file), threading.Lock()
+            )
 
-            # Headers
-            f.write("<tr>\n")
-            for col in columns:
-                f.write(f"<th>{self._escape_html(col)}</th>\n")
-            f.write("</tr>\n")
+    def _save_state(self, state_file, state):
+        # Written to a temporary file first so a crash never leaves a truncated
+        # state file behind.
+        fd, tmp_file = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(state_file)),
+            prefix=os.path.basename(state_file) + ".",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, state_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+
+    def _copy_query(self, query, output_file, options):
+        # DuckDB runs, renders and writes the whole COPY itself, so it is
+        # accounted as a single write.
+        self._record_output(output_file)
+        with self._phase("write"):
+            result = self.conn.execute(
+                f"COPY ({query}) TO '{output_file}' ({options})"
+            ).fetchone()
+        rows = result[0] if result else 0
+        self._report_progress(rows)
+        return rows
+
+    def export_table_incremental(
+        self,
+        table_name,
+        output_file,
+        watermark_column,
+        file_format="parquet",
+        mode="append",
+        state_file=None,
+        columns=None,
+        where=None,
+        query=None,
+        compression=None,
+    ):
+        if file_format not in self.INCREMENTAL_FORMATS:
+            raise ValueError(f"Unsupported incremental format: {file_format}")
+        if mode not in ("append", "merge"):
+            raise ValueError(f"Unsupported incremental mode: {mode}")
+        if state_file is None:
+            state_file = os.path.join(
+                os.path.dirname(os.path.abspath(output_file)), self.STATE_FILE_NAME
+            )
+
+        source = self._source_query(table_name, columns, where, query)
+        column_types = dict(self._get_export_column_info(table_name, columns, query))
+        if watermark_column not in column_types:
+            raise ValueError(
+                f"Column '{watermark_column}' does not exist in table '{table_name}'"
+            )
+        col_type = column_types[watermark_column]
+        column = quote_identifier(watermark_column)
+
+        # Watermarks are kept per database, table and output, so the same table
+        # can feed several incremental exports independently.
+        with self._state_lock(state_file):
+            state = self._load_state(state_file)
+        table_state = (
+            state.get(os.path.abspath(self.db_path), {})
+            .get(table_name, {})
+            .get(os.path.abspath(output_file))
+        )
+        if table_state and table_state["column"] != watermark_column:
+            raise ValueError(
+                f"Table '{table_name}' was exported with watermark column "
+                f"'{table_state['column']}'"
+            )
 
-            # Data rows
-            for row in data:
-                f.write("<tr>\n")
-                for value in row:
-                    f.write(f"<td>{self._escape_html(value)}</td>\n")
-                f.write("</tr>\n")
+        lower_bound = "TRUE"
+        if table_state:
+            lower_bound = (
+                f"{column} > CAST({self._escape_value(table_state['value'])} "
+                f"AS {col_type})"
+            )
+        # The new high-water mark is fixed before copying, so rows committed
+        # while the export runs are left for the next run instead of being lost.
+        with self._phase("query"):
+            high_water_mark = self.conn.execute(
+                f"SELECT CAST(max({column}) AS VARCHAR) FROM ({source}) AS src "
+                f"WHERE {lower_bound}"
+            ).fetchone()[0]
+        if high_water_mark is None:
+            return {"rows": 0, "watermark": table_state and table_state["value"]}
+
+        query = (
+            f"SELECT * FROM ({source}) AS src WHERE {lower_bound} AND {column} <= "
+            f"CAST({self._escape_value(high_water_mark)} AS {col_type}) "
+            f"ORDER BY {column}"
+        )
+        options = ", ".join(
+            [self.INCREMENTAL_FORMATS[file_format]]
+            + self._copy_compression_option(compression)
+        )
+        parts = table_state["parts"] if table_state else 0
+        if mode == "append":
+            base, extension = split_output_name(output_file)
+            target_file = f"{base}_part{parts + 1:05d}{extension}"
+            rows = self._copy_query(query, target_file, options)
+        elif not os.path.exists(output_file):
+            target_file = output_file
+            rows = self._copy_query(query, target_file, options)
+        else:
+            target_file = output_file
+            rows = self._merge_into(
+                query, output_file, file_format, options, compression
+            )
+
+        # The file is read again under the lock, so watermarks other exports
+        # saved in the meantime are kept.
+        with self._state_lock(state_file):
+            state = self._load_state(state_file)
+            outputs = state.setdefault(os.path.abspath(self.db_path), {}).setdefault(
+                table_name, {}
+            )
+            outputs[os.path.abspath(output_file)] = {
+                "column": watermark_column,
+                "value": high_water_mark,
+                "parts": parts + 1,
+                "format": file_format,
+                "mode": mode,
+            }
+            self._save_state(state_file, state)
+        return {"rows": rows, "watermark": high_water_mark, "file": target_file}
 
+    def _merge_into(self, query, output_file, file_format, options, compression):
+        tmp_file = output_file + ".tmp"
+        try:
+            if file_format == "csv":
+                # CSV rows can simply be appended after the existing ones; a
+                # compressed file takes the new rows as one more gzip member or
+                # zstd frame.
+                compression = compression or compression_from_name(output_file)
+                rows = self._copy_query(
+                    query,
+                    tmp_file,
+                    ", ".join(
+                        ["FORMAT CSV", "HEADER false"]
+                        + self._copy_compression_option(compression)
+                    ),
+                )
+                with open(output_file, "ab") as out, open(tmp_file, "rb") as new:
+                    shutil.copyfileobj(new, out, self.WRITE_BUFFER_SIZE)
+                os.remove(tmp_file)
+                return rows
+            with self._phase("query"):
+                rows = self.conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[
+                    0
+                ]
+            self._copy_query(
+                f"SELECT * FROM read_parquet('{output_file}') "
+                f"UNION ALL BY NAME ({query})",
+                tmp_file,
+                options,
+            )
+            os.replace(tmp_file, output_file)
+            return rows
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _html_cell_expr(self, column):
+        # Same escaping as _escape_html, applied by DuckDB to whole columns.
+        escaped = f"CAST({quote_identifier(column)} AS VARCHAR)"
+        for char, entity in self.HTML_ESCAPES:
+            escaped = (
+                f"replace({escaped}, {self._escape_value(char)}, "
+                f"{self._escape_value(entity)})"
+            )
+        return f"COALESCE({escaped}, 'NULL')"
+
+    def _html_rows_query(self, source, columns):
+        cells = ", ".join(
+            f"'<td>', {self._html_cell_expr(column)}, '</td>', chr(10)"
+            for column in columns
+        )
+        return (
+            f"SELECT concat('<tr>', chr(10), {cells}, '</tr>', chr(10)) "
+            f"FROM ({source}) AS src"
+        )
+
+    def _html_header_row(self, columns):
+        return (
+            "<tr>\n"
+            + "".join(f"<th>{self._escape_html(col)}</th>\n" for col in columns)
+            + "</tr>\n"
+        )
+
+    def _html_document_start(self, title, extra_style=""):
+        return (
+            "<!DOCTYPE html>\n<html>\n<head>\n"
+            f"<title>{self._escape_html(title)}</title>\n"
+            "<style>\n"
+            "table { border-collapse: collapse; width: 100%; }\n"
+            "th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }\n"
+            "th { background-color: #f2f2f2; }\n"
+            "tr:nth-child(even) { background-color: #f9f9f9; }\n"
+            f"{extra_style}"
+            "</style>\n"
+            "</head>\n<body>\n"
+        )
+
+    def _write_html_rows(self, f, source, columns):
+        # Each batch arrives as pre-rendered <tr> blocks and is written at once.
+        return self._write_rendered_query(f, self._html_rows_query(source, columns))
+
+    def export_table_html(
+        self,
+        table_name,
+        output_file,
+        rows_per_page=None,
+        columns=None,
+        where=None,
+        query=None,
+        compression=None,
+    ):
+        source = self._source_query(table_name, columns, where, query)
+        columns = [
+            name for name, _ in self._get_export_column_info(table_name, columns, query)
+        ]
+        if rows_per_page:
+            return self._export_table_html_pages(
+                table_name, source, columns, output_file, rows_per_page, compression
+            )
+        with self._open_output(output_file, compression) as f:
+            f.write(self._html_document_start("Table Export"))
+            f.write(f"<h2>Table: {self._escape_html(table_name)}</h2>\n")
+            f.write("<table>\n")
+            f.write(self._html_header_row(columns))
+            self._write_html_rows(f, source, columns)
             f.write("</table>\n")
             f.write("</body>\n</html>")
         return True
 
-    def export_table_sqlite(self, table_name, output_file):
+    def _html_page_nav(self, index_name, previous_name, next_name):
+        links = []
+        if previous_name:
+            links.append(f'<a href="{previous_name}">&laquo; Previous</a>')
+        links.append(f'<a href="{index_name}">Index</a>')
+        if next_name:
+            links.append(f'<a href="{next_name}">Next &raquo;</a>')
+        return "<p>" + " | ".join(links) + "</p>\n"
 
-        sqlite_conn = sqlite3.connect(output_file)
-        sqlite_cursor = sqlite_conn.cursor()
+    def _export_table_html_pages(
+        self, table_name, source, columns, output_file, rows_per_page, compression
+    ):
+        base, extension = split_output_name(output_file)
+        index_name = os.path.basename(output_file)
+        header_row = self._html_header_row(columns)
+        page_names = []
+        page_rows = []
+        page = None
 
-        schema = self.get_create_table_sql(table_name)
+        def page_name(number):
+            return f"{os.path.basename(base)}_page{number:04d}{extension}"
 
-        schema = schema.rstrip(";")
+        def close_page(has_next):
+            number = len(page_names)
+            page.write("</table>\n")
+            page.write(
+                self._html_page_nav(
+                    index_name,
+                    page_name(number - 1) if number > 1 else None,
+                    page_name(number + 1) if has_next else None,
+                )
+            )
+            page.write("</body>\n</html>")
+            page.close()
 
         try:
+            query = self._html_rows_query(source, columns)
+            for rows in self._iter_batches(query):
+                position = 0
+                while position < len(rows):
+                    if page is None or page_rows[-1] == rows_per_page:
+                        # A page is only finished once the next row exists, so
+                        # the last page never links to a page that is missing.
+                        if page is not None:
+                            close_page(True)
+                        page_names.append(page_name(len(page_names) + 1))
+                        page_rows.append(0)
+                        page = self._open_output(
+                            os.path.join(os.path.dirname(output_file), page_names[-1]),
+                            compression,
+                        )
+                        page.write(
+                            self._html_document_start(
+                                f"{table_name} - page {len(page_names)}"
+                            )
+                        )
+                        page.write(
+                            f"<h2>Table: {self._escape_html(table_name)} "
+                            f"(page {len(page_names)})</h2>\n<table>\n"
+                        )
+                        page.write(header_row)
+                    chunk = rows[position : position + rows_per_page - page_rows[-1]]
+                    self._write_rendered(page, chunk)
+                    page_rows[-1] += len(chunk)
+                    position += len(chunk)
+            if page is not None:
+                close_page(False)
+                page = None
+        finally:
+            if page is not None:
+                page.close()
 
-            sqlite_cursor.execute(schema)
+        with self._open_output(output_file, compression) as f:
+            f.write(self._html_document_start("Table Export"))
+            f.write(f"<h2>Table: {self._escape_html(table_name)}</h2>\n<ul>\n")
+            first_row = 1
+            for number, (name, count) in enumerate(zip(page_names, page_rows), 1):
+                f.write(
+                    f'<li><a href="{name}">Page {number}</a> '
+                    f"(rows {first_row}-{first_row + count - 1})</li>\n"
+                )
+                first_row += count
+            if not page_names:
+                f.write("<li>No rows</li>\n")
+            f.write("</ul>\n</body>\n</html>")
+        return True
 
-            data = self.conn.execute(f"SELECT * FROM {table_name}").fetchall()
-            columns = [
-                row[1]
-                for row in self.conn.execute(
-                    f"PRAGMA table_info({table_name})"
-                ).fetchall()
-            ]
+    def _write_table_html_section(self, f, table_name):
+        columns = self._get_columns(table_name)
+        f.write(f"<h2>Table: {self._escape_html(table_name)}</h2>\n")
+        f.write("<table>\n")
+        f.write(self._html_header_row(columns))
+        row_count = self._write_html_rows(f, self._source_query(table_name), columns)
+        f.write("</table>\n")
+        return row_count
+
+    def export_all_tables_html(
+        self, output_file, tables=None, workers=1, concatenate=True, compression=None
+    ):
+        header = self._html_document_start(
+            "All Tables Export",
+            "table { margin-bottom: 20px; }\ntd { white-space: pre-wrap; }\n",
+        )
+        return self._export_all_tables(
+            output_file,
+            tables,
+            ExportManager._write_table_html_section,
+            header,
+            "</body>\n</html>",
+            workers,
+            concatenate,
+            compression,
+        )
+
+    def _sqlite_extension_available(self):
+        # The outcome is cached for the lifetime of this manager.
+        if self._sqlite_extension is None:
+            self._sqlite_extension = False
+            if self.USE_SQLITE_EXTENSION:
+                try:
+                    row = self.conn.execute(self.SQLITE_EXTENSION_QUERY).fetchone()
+                    installed, loaded = row or (False, False)
+                    if not installed and self.INSTALL_SQLITE_EXTENSION:
+                        self.conn.execute("INSTALL sqlite")
+                        installed = True
+                    if installed and not loaded:
+                        self.conn.execute("LOAD sqlite")
+                    self._sqlite_extension = bool(installed or loaded)
+                except duckdb.Error:
+                    pass
+        return self._sqlite_extension
+
+    def _prepare_sqlite(self, sqlite_conn):
+        # page_size only applies to a database that has no tables yet.
+        sqlite_conn.execute(f"PRAGMA page_size={self.SQLITE_PAGE_SIZE}")
+        for pragma in self.SQLITE_PRAGMAS:
+            sqlite_conn.execute(pragma)
+
+    def _sqlite_source(self, source, column_info):
+        # Values are converted per column inside DuckDB, so sqlite3 only ever
+        # sees types it can bind.
+        values = ", ".join(
+            f"{sqlite_value_expr(quote_identifier(column), col_type)} "
+            f"AS {quote_identifier(column)}"
+            for column, col_type in column_info
+        )
+        return f"SELECT {values} FROM ({source}) AS src"
+
+    def _copy_to_sqlite_attached(self, output_file, table_name, source):
+        alias = f"sqlite_export_{next(self._sqlite_aliases)}"
+        # An attached database takes the read-only mode of the shared instance
+        # unless it asks for write access.
+        self.conn.execute(
+            f"ATTACH {self._escape_value(output_file)} AS {alias} "
+            "(TYPE SQLITE, READ_WRITE)"
+        )
+        try:
+            with self._phase("write"):
+                result = self.conn.execute(
+                    f"INSERT INTO {alias}.{self._sql_name(table_name)} {source}"
+                ).fetchone()
+        finally:
+            self.conn.execute(f"DETACH {alias}")
+        rows = result[0] if result else 0
+        self._report_progress(rows)
+        return rows
+
+    def _copy_to_sqlite_batched(self, sqlite_conn, table_name, source, columns):
+        placeholders = ", ".join(["?" for _ in columns])
+        insert_sql = (
+            f"INSERT INTO {self._sql_name(table_name)} "
+            f"({', '.join(self._sql_name(column) for column in columns)}) "
+            f"VALUES ({placeholders})"
+        )
+        rows = 0
+        sqlite_cursor = sqlite_conn.cursor()
+        for batch in self._iter_batches(source):
+            with self._phase("write"):
+                sqlite_cursor.executemany(insert_sql, batch)
+            rows += len(batch)
+        return rows
+
+    def _create_sqlite_indexes(self, sqlite_conn, table_name):
+        indexes = self.connection_manager.ddl.create_indexes(table_name)
+        with self._phase("schema"):
+            for index_sql in indexes:
+                sqlite_conn.execute(index_sql.rstrip(";"))
+
+    def _export_table_to_sqlite(
+        self, sqlite_conn, output_file, table_name, columns=None, where=None, query=None
+    ):
+        schema = self.get_create_table_sql(table_name, columns, query, portable=True)
+        with self._phase("schema"):
+            sqlite_conn.execute(schema.rstrip(";"))
+            sqlite_conn.commit()
+
+        column_info = self._get_export_column_info(table_name, columns, query)
+        source = self._sqlite_source(
+            self._source_query(table_name, columns, where, query), column_info
+        )
+        rows = None
+        if self._sqlite_extension_available():
+            try:
+                rows = self._copy_to_sqlite_attached(output_file, table_name, source)
+            except duckdb.Error as e:
+                print(f"SQLite extension copy failed, using batched copy: {str(e)}")
+                sqlite_conn.execute(f"DELETE FROM {self._sql_name(table_name)}")
+        if rows is None:
+            # One transaction for the whole table; sqlite3 opens it implicitly
+            # on the first INSERT.
+            rows = self._copy_to_sqlite_batched(
+                sqlite_conn, table_name, source, [name for name, _ in column_info]
+            )
 
-            if data:
-                placeholders = ", ".join(["?" for _ in columns])
-                insert_sql = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
-                sqlite_cursor.executemany(insert_sql, data)
+        # Indexes are built once the data is loaded, which is much cheaper than
+        # maintaining them row by row. A projection or query may not contain
+        # the indexed columns, so only whole tables get them.
+        if not columns and not query:
+            self._create_sqlite_indexes(sqlite_conn, table_name)
+        with self._phase("write"):
+            sqlite_conn.commit()
+        return rows
+
+    def _export_table_to_sqlite_checkpointed(
+        self, sqlite_conn, checkpoint, table_name, columns=None, where=None, query=None
+    ):
+        name = self._sql_name(table_name)
+        progress = checkpoint.progress(table_name)
+        if progress is None:
+            # The table may have been created just before a crash that left it
+            # out of the sidecar.
+            schema = self.get_create_table_sql(
+                table_name, columns, query, portable=True
+            )
+            with self._phase("schema"):
+                sqlite_conn.execute(f"DROP TABLE IF EXISTS {name}")
+                sqlite_conn.execute(schema.rstrip(";"))
+                sqlite_conn.commit()
+            progress = checkpoint.start_table(table_name)
+            checkpoint.commit()
+        if progress["done"]:
+            return progress["rows"]
+
+        # The SQLite file itself is the authority on what was committed, and
+        # indexes from an interrupted run are built again at the end.
+        progress["rows"] = sqlite_conn.execute(
+            f"SELECT COUNT(*) FROM {name}"
+        ).fetchone()[0]
+        for (index_name,) in sqlite_conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+            "AND sql IS NOT NULL",
+            [table_name],
+        ).fetchall():
+            sqlite_conn.execute(f"DROP INDEX {quote_identifier(index_name)}")
+        column_info = self._get_export_column_info(table_name, columns, query)
+        source = self._source_query(table_name, columns, where, query)
 
+        def chunk_source():
+            chunk, _ = self._resume_source(
+                table_name,
+                source,
+                column_info,
+                query,
+                progress["rows"],
+                limit=self.SQLITE_CHECKPOINT_ROWS,
+            )
+            return self._sqlite_source(chunk, column_info)
+
+        # Rows are committed in large chunks, each copied through the SQLite
+        # extension when it is loaded, or in batches otherwise.
+        while True:
+            self._check_cancelled()
+            rows = None
+            if self._sqlite_extension_available():
+                try:
+                    rows = self._copy_to_sqlite_attached(
+                        checkpoint.partial_file, table_name, chunk_source()
+                    )
+                except duckdb.Error as e:
+                    print(f"SQLite extension copy failed, using batched copy: {str(e)}")
+                    progress["rows"] = sqlite_conn.execute(
+                        f"SELECT COUNT(*) FROM {name}"
+                    ).fetchone()[0]
+            if rows is None:
+                rows = self._copy_to_sqlite_batched(
+                    sqlite_conn,
+                    table_name,
+                    chunk_source(),
+                    [column for column, _ in column_info],
+                )
+            progress["rows"] += rows
+            with self._phase("write"):
+                sqlite_conn.commit()
+                checkpoint.commit()
+            if rows < self.SQLITE_CHECKPOINT_ROWS:
+                break
+        if not columns and not query:
+            self._create_sqlite_indexes(sqlite_conn, table_name)
+        progress["done"] = True
+        with self._phase("write"):
             sqlite_conn.commit()
+            checkpoint.commit()
+        return progress["rows"]
+
+    def _export_sqlite_checkpointed(self, output_file, settings, tables):
+        checkpoint = ExportCheckpoint(
+            output_file,
+            dict(settings, format="sqlite", database=os.path.abspath(self.db_path)),
+        )
+        self._record_output(output_file)
+        results = []
+        sqlite_conn = sqlite3.connect(checkpoint.partial_file)
+        try:
+            self._prepare_sqlite(sqlite_conn)
+            for pragma in self.SQLITE_CHECKPOINT_PRAGMAS:
+                sqlite_conn.execute(pragma)
+            for table_name, columns, where, query in tables:
+                self._check_cancelled()
+                started = time.perf_counter()
+                rows = self._export_table_to_sqlite_checkpointed(
+                    sqlite_conn, checkpoint, table_name, columns, where, query
+                )
+                results.append(
+                    self._table_result(table_name, rows, started, output_file)
+                )
+        finally:
+            sqlite_conn.close()
+        checkpoint.finish()
+        return results
+
+    def export_table_sqlite(
+        self,
+        table_name,
+        output_file,
+        columns=None,
+        where=None,
+        query=None,
+        resumable=False,
+    ):
+        if resumable:
+            self._export_sqlite_checkpointed(
+                output_file,
+                {
+                    "tables": [table_name],
+                    "columns": columns,
+                    "where": where,
+                    "query": query,
+                },
+                [(table_name, columns, where, query)],
+            )
+            return True
+        self._record_output(output_file)
+        sqlite_conn = sqlite3.connect(output_file)
+        try:
+            self._prepare_sqlite(sqlite_conn)
+            self._export_table_to_sqlite(
+                sqlite_conn, output_file, table_name, columns, where, query
+            )
             return True
         except Exception as e:
             print(f"Error exporting to SQLite: {str(e)}")
@@ -156,36 +1496,264 @@ class ExportManager:
         finally:
             sqlite_conn.close()
 
-    def export_table_xml(self, table_name, output_file):
+    def export_all_tables_sqlite(self, output_file, tables=None, resumable=False):
+        # Like the SQL dump, the whole database means its tables; views have no
+        # portable definition and are left out.
+        if tables is None:
+            tables = self.connection_manager.schema.table_names("table")
+        if resumable:
+            return self._export_sqlite_checkpointed(
+                output_file,
+                {"tables": tables},
+                [(table_name, None, None, None) for table_name in tables],
+            )
+        # One connection, one set of pragmas and one transaction per table for
+        # the whole file.
+        self._record_output(output_file)
+        sqlite_conn = sqlite3.connect(output_file)
+        try:
+            self._prepare_sqlite(sqlite_conn)
+            results = []
+            for table_name in tables:
+                self._check_cancelled()
+                started = time.perf_counter()
+                rows = self._export_table_to_sqlite(
+                    sqlite_conn, output_file, table_name
+                )
+                results.append(
+                    self._table_result(table_name, rows, started, output_file)
+                )
+            return results
+        finally:
+            sqlite_conn.close()
+
+    def _snapshot_format(self, table_name, formats):
+        # CSV and JSON lose some values (empty blobs, NULL unions...), so they
+        # are only used when asked for.
+        file_format = (formats or {}).get(table_name, DEFAULT_FORMAT)
+        if file_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unsupported snapshot format: {file_format}")
+        return file_format
+
+    def _snapshot_query(self, table_name, file_format):
+        column_info = self._get_column_info(table_name)
+        if file_format != "parquet" or not any(
+            PARQUET_TEXT_TYPES.search(col_type) for _, col_type in column_info
+        ):
+            return self._source_query(table_name)
+        values = ", ".join(
+            (
+                f"CAST({quote_identifier(column)} AS VARCHAR) "
+                f"AS {quote_identifier(column)}"
+                if PARQUET_TEXT_TYPES.search(col_type)
+                else quote_identifier(column)
+            )
+            for column, col_type in column_info
+        )
+        return f"SELECT {values} FROM {self._sql_name(table_name)}"
+
+    def _export_snapshot_table(self, table_name, file_format, output_dir, index):
+        extension, options = SNAPSHOT_FORMATS[file_format]
+        file_name = self._part_file_name(index, table_name, extension)
+        path = os.path.join(output_dir, file_name)
+        rows = self._copy_query(
+            self._snapshot_query(table_name, file_format), path, options
+        )
+        with self._phase("write"):
+            checksum = file_checksum(path)
+        return {
+            "table": table_name,
+            "format": file_format,
+            "file": file_name,
+            "rows": rows,
+            "bytes": os.path.getsize(path),
+            "sha256": checksum,
+            "references": sorted(self.connection_manager.ddl.references(table_name)),
+        }
+
+    def export_database_snapshot(
+        self, output_dir, tables=None, formats=None, workers=1, settings=None
+    ):
+        # Every table is copied by DuckDB in its own format, several at a time.
+        # schema.sql and post_load.sql hold the DDL around the data and the
+        # manifest, written last, lists every file with its row count, size and
+        # checksum; snapshot.import_snapshot() loads it back.
+        tables, sequences, post_load = self._get_dump_objects(tables)
+        table_formats = {
+            table_name: self._snapshot_format(table_name, formats)
+            for table_name in tables
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_file):
+            os.remove(manifest_file)
+
+        previous_settings = None
+        if settings:
+            previous_settings = self.connection_manager.get_settings()
+            self.connection_manager.configure(**settings)
+        try:
+            with open(
+                os.path.join(output_dir, SCHEMA_NAME), "w", encoding="utf-8"
+            ) as f:
+                f.write("".join(s + "\n" for s in sequences))
+                for table_name in tables:
+                    f.write(self.get_create_table_sql(table_name) + "\n")
+            with open(
+                os.path.join(output_dir, POST_LOAD_NAME), "w", encoding="utf-8"
+            ) as f:
+                f.write("".join(s + "\n" for s in post_load))
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [
+                    pool.submit(
+                        self.run_on_worker,
+                        ExportManager._export_snapshot_table,
+                        table_name,
+                        table_formats[table_name],
+                        output_dir,
+                        i,
+                    )
+                    for i, table_name in enumerate(tables, 1)
+                ]
+                entries = [future.result() for future in futures]
+        finally:
+            if previous_settings:
+                self.connection_manager.configure(
+                    **{
+                        name: value
+                        for name, value in previous_settings.items()
+                        if name in settings
+                    }
+                )
+
+        manifest = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "database": os.path.basename(self.db_path),
+            "duckdb": duckdb.__version__,
+            "schema": SCHEMA_NAME,
+            "post_load": POST_LOAD_NAME,
+            "tables": entries,
+        }
+        with open(manifest_file + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_file + ".tmp", manifest_file)
+        return manifest
+
+    def _measure_sample(self, method, table_name, output_file, limit):
+        started = time.perf_counter()
+        getattr(self, method)(
+            table_name,
+            output_file,
+            query=f"SELECT * FROM {self._sql_name(table_name)} LIMIT {int(limit)}",
+        )
+        seconds = time.perf_counter() - started
+        size = os.path.getsize(output_file)
+        os.remove(output_file)
+        return size, seconds
+
+    def estimate_exports(self, table_name, row_count, formats=None, sample_rows=None):
+        # Every format exports an empty sample and one of the first rows through
+        # its real code path. The empty one measures the fixed costs (headers,
+        # schema, file setup); only the per-row part is scaled to the table.
+        sample_rows = min(sample_rows or self.ESTIMATE_SAMPLE_ROWS, row_count)
+        scale = row_count / sample_rows if sample_rows else 0
+        estimates = {}
+        metrics, self.metrics = self.metrics, None
+        # Estimating must not install the SQLite extension; it is only used
+        # when an earlier export already loaded it.
+        sqlite_extension = self._sqlite_extension
+        self._sqlite_extension = bool(sqlite_extension)
+        try:
+            with tempfile.TemporaryDirectory() as sample_dir:
+                for file_format in formats or self.ESTIMATE_FORMATS:
+                    method, extension = self.ESTIMATE_FORMATS[file_format]
+                    output_file = os.path.join(sample_dir, file_format + extension)
+                    fixed_size, fixed_seconds = self._measure_sample(
+                        method, table_name, output_file, 0
+                    )
+                    size, seconds = self._measure_sample(
+                        method, table_name, output_file, sample_rows
+                    )
+                    estimates[file_format] = {
+                        "bytes": int(fixed_size + max(size - fixed_size, 0) * scale),
+                        "seconds": fixed_seconds
+                        + max(seconds - fixed_seconds, 0) * scale,
+                    }
+        finally:
+            self.metrics = metrics
+            self._sqlite_extension = sqlite_extension
+        return estimates
+
+    def _xml_element_names(self, columns):
+        # Column names are not always valid XML names (spaces, leading digits,
+        # an "xml" prefix), so they are mapped to safe and unique ones.
+        names = []
+        for column in columns:
+            name = re.sub(r"[^A-Za-z0-9_.-]", "_", column)
+            if not re.match(r"[A-Za-z_]", name) or name.lower().startswith("xml"):
+                name = "_" + name
+            unique_name = name
+            suffix = 2
+            while unique_name in names:
+                unique_name = f"{name}_{suffix}"
+                suffix += 1
+            names.append(unique_name)
+        return names
+
+    def _xml_rows_query(self, source, columns, field_elements):
+        if field_elements:
+            tags = [
+                (f'<field name="{self._escape_html(column)}">', "</field>")
+                for column in columns
+            ]
+        else:
+            tags = [
+                (f"<{name}>", f"</{name}>") for name in self._xml_element_names(columns)
+            ]
+        cells = ", ".join(
+            f"'      ', {self._escape_value(open_tag)}, "
+            f"{self._html_cell_expr(column)}, {self._escape_value(close_tag)}, chr(10)"
+            for column, (open_tag, close_tag) in zip(columns, tags)
+        )
+        return (
+            f"SELECT concat('    <row>', chr(10), {cells}, '    </row>', chr(10)) "
+            f"FROM ({source}) AS src"
+        )
+
+    def export_table_xml(
+        self,
+        table_name,
+        output_file,
+        field_elements=False,
+        compression=None,
+        columns=None,
+        where=None,
+        query=None,
+    ):
+        source = self._source_query(table_name, columns, where, query)
         columns = [
-            row[1]
-            for row in self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+            name for name, _ in self._get_export_column_info(table_name, columns, query)
         ]
-        data = self.conn.execute(f"SELECT * FROM {table_name}").fetchall()
-
-        with open(output_file, "w", encoding="utf-8") as f:
+        query = self._xml_rows_query(source, columns, field_elements)
+        with self._open_output(output_file, compression) as f:
             f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write(f'<table name="{table_name}">\n')
+            f.write(f'<table name="{self._escape_html(table_name)}">\n')
             f.write("  <columns>\n")
             for col in columns:
                 f.write(f"    <column>{self._escape_html(col)}</column>\n")
             f.write("  </columns>\n")
             f.write("  <rows>\n")
-            for row in data:
-                f.write("    <row>\n")
-                for i, value in enumerate(row):
-                    f.write(
-                        f"      <{columns[i]}>{self._escape_html(value)}</{columns[i]}>\n"
-                    )
-                f.write("    </row>\n")
+            self._write_rendered_query(f, query)
             f.write("  </rows>\n")
             f.write("</table>\n")
         return True
 
     def close(self):
         if self.conn:
-            self.conn.close()
+            self.connection_manager.release(self.conn)
             self.conn = None
+            if self._owns_connection_manager:
+                self.connection_manager.close()
 
     def __del__(self):
         self.close()
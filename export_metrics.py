@@ -0,0 +1,94 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class ExportMetrics:
+    PHASES = ("schema", "query", "fetch", "render", "write")
+
+    def __init__(self, callback=None, context=None):
+        self.callback = callback
+        self.context = context or {}
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.rows = 0
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self.current_phase = None
+        self.outputs = set()
+        self._lock = threading.Lock()
+
+    def _emit(self, event, **data):
+        if self.callback:
+            self.callback(dict(self.context, event=event, **data))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        # Phase times are summed over all threads, so with parallel workers they
+        # can add up to more than the wall time.
+        if name != self.current_phase:
+            self.current_phase = name
+            self._emit("phase", phase=name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_rows(self, rows):
+        with self._lock:
+            self.rows += rows
+            total = self.rows
+        self._emit("rows", rows=rows, total=total)
+
+    def add_output(self, path):
+        with self._lock:
+            self.outputs.add(os.path.abspath(path))
+
+    def bytes_written(self):
+        # Outputs are measured on disk once the export is over; temporary parts
+        # that have been merged away are no longer there and are not counted.
+        size = 0
+        for path in self.outputs:
+            if os.path.isfile(path):
+                size += os.path.getsize(path)
+            for root, _, files in os.walk(path):
+                size += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        return size
+
+    def as_dict(self):
+        seconds = self.seconds
+        if seconds is None:
+            seconds = time.perf_counter() - self.started
+        return {
+            "seconds": seconds,
+            "rows": self.rows,
+            "bytes": self.bytes_written(),
+            "rows_per_second": self.rows / seconds if seconds > 0 else 0.0,
+            "phases": dict(self.phases),
+        }
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        record = self.as_dict()
+        self._emit("finish", **record)
+        return record
+
+
+class JsonLinesLog:
+
+    def __init__(self, stream, events=("phase", "finish")):
+        self.stream = stream
+        self.events = events
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        if self.events and event["event"] not in self.events:
+            return
+        line = json.dumps(dict(event, time=time.time()), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
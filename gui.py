@@ -1,9 +1,13 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import os
 import sys
+import threading
+from compression import compression_from_name
 from db_manager import DBManager
 from export_manager import ExportManager
+from job_executor import JobExecutor
+from table_pager import TablePager
 
 
 class App(tk.Tk):
@@ -16,6 +20,24 @@ class App(tk.Tk):
     PADDING = 10
     FONT_DEFAULT = ("Helvetica", 10)
     FONT_BOLD = ("Helvetica", 10, "bold")
+    POLL_INTERVAL_MS = 100
+    EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+    PREVIEW_ROW_HEIGHT = 22
+    PREVIEW_HEADER_HEIGHT = 26
+    MAX_SUMMARY_LINES = 20
+    HTML_ROWS_PER_PAGE = 50000
+    QUERY_RESULT_NAME = "query_result"
+    PROFILE_HEADINGS = ("Column", "Type", "NULLs", "Distinct", "Min", "Max")
+    ESTIMATE_HEADINGS = ("Format", "Estimated size", "Estimated time")
+    QUERY_EXPORT_METHODS = {
+        ".csv": "export_table_csv",
+        ".parquet": "export_table_parquet",
+        ".json": "export_table_json",
+        ".sql": "export_table_sql",
+        ".html": "export_table_html",
+        ".xml": "export_table_xml",
+        ".db": "export_table_sqlite",
+    }
 
     def __init__(self):
         super().__init__()
@@ -30,22 +52,34 @@ class App(tk.Tk):
         self.export_manager = None
         self.db_path = ""
         self.filtered_tables = []
+        self.job_executor = JobExecutor()
+        self.current_job = None
+        self.row_counts_version = 0
+        # Resumable exports write through a checkpoint and skip the bulk paths,
+        # so they are opt-in.
+        self.resumable_exports = tk.BooleanVar(self, value=False)
 
         self.export_options = {
             "Export Structure (SQL)": self.export_sql_structure_only,
             "Export Structure & Data (SQL)": self.export_sql,
             "Export All Tables (SQL)": self.export_all_tables_sql,
             "Export Data (SQLite)": self.export_sqlite,
+            "Export All Tables (SQLite)": self.export_all_tables_sqlite,
             "Export Data (XML)": self.export_xml,
             "Export Data (CSV)": self.export_csv,
             "Export Data (JSON)": self.export_json,
             "Export Data (Parquet)": self.export_parquet,
             "Export Data (HTML)": self.export_html,
             "Export All Tables (HTML)": self.export_all_tables_html,
+            "Export Database Snapshot": self.export_database_snapshot,
+            "Export Query Result": self.export_query,
         }
 
         self.init_ui()
         self.apply_styles()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.bind("<F5>", lambda event: self.refresh_database())
+        self.after(self.POLL_INTERVAL_MS, self.poll_jobs)
 
     def _set_icon(self):
         try:
@@ -80,6 +114,11 @@ class App(tk.Tk):
         )
         self.preview_button.pack(side=tk.LEFT, padx=5)
 
+        self.profile_button = ttk.Button(
+            top_frame, text="Profile", command=self.show_profile, style="Custom.TButton"
+        )
+        self.profile_button.pack(side=tk.LEFT, padx=5)
+
         self.export_button = ttk.Button(
             top_frame, text="Export", style="Custom.TButton"
         )
@@ -105,10 +144,26 @@ class App(tk.Tk):
         self.search_entry.pack(side=tk.LEFT, padx=5)
         self.search_entry.bind("<KeyRelease>", self.filter_tables)
 
+        self.progress_frame = tk.Frame(self, bg=self.BACKGROUND_COLOR)
+        self.progress_frame.pack(pady=(0, self.PADDING))
         self.progress = ttk.Progressbar(
-            self, orient="horizontal", length=200, mode="determinate"
+            self.progress_frame, orient="horizontal", length=200, mode="determinate"
+        )
+        self.progress.pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(
+            self.progress_frame,
+            text="Cancel",
+            command=self.cancel_export,
+            style="Custom.TButton",
         )
-        self.progress.pack(pady=(0, self.PADDING))
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.progress_label = tk.Label(
+            self.progress_frame,
+            bg=self.BACKGROUND_COLOR,
+            fg=self.FOREGROUND_COLOR,
+            font=self.FONT_DEFAULT,
+        )
+        self.progress_label.pack(side=tk.LEFT)
 
         self.export_menu = tk.Menu(
             self,
@@ -119,6 +174,10 @@ class App(tk.Tk):
         )
         for option, command in self.export_options.items():
             self.export_menu.add_command(label=option, command=command)
+        self.export_menu.add_separator()
+        self.export_menu.add_checkbutton(
+            label="Resumable SQL/SQLite exports", variable=self.resumable_exports
+        )
         self.export_button.bind(
             "<Button-1>", lambda event: self.show_export_menu(event)
         )
@@ -161,7 +220,7 @@ class App(tk.Tk):
         self.db_label.bind("<Button-1>", self.open_directory)
         self.db_label.config(underline=True)
 
-        self.progress.pack_forget()
+        self.progress_frame.pack_forget()
 
     def apply_styles(self):
         style = ttk.Style()
@@ -180,6 +239,22 @@ class App(tk.Tk):
             background=[("active", self.ACCENT_COLOR_ACTIVE)],
             foreground=[("active", "white")],
         )
+        style.configure(
+            "Preview.Treeview",
+            font=self.FONT_DEFAULT,
+            rowheight=self.PREVIEW_ROW_HEIGHT,
+            background=self.CARD_COLOR,
+            fieldbackground=self.CARD_COLOR,
+            foreground=self.FOREGROUND_COLOR,
+            borderwidth=0,
+        )
+        style.configure(
+            "Preview.Treeview.Heading",
+            font=self.FONT_BOLD,
+            background=self.BACKGROUND_COLOR,
+            foreground=self.FOREGROUND_COLOR,
+            relief="flat",
+        )
 
     def show_export_menu(self, event):
         self.export_menu.post(event.x_root, event.y_root)
@@ -200,25 +275,48 @@ class App(tk.Tk):
                 messagebox.showerror("Error", f"Could not open directory: {str(e)}")
 
     def update_tables(self):
-        self.listbox.delete(0, tk.END)
         if self.db_manager.conn is None and self.db_path:
             self.db_manager.connect()
-        tables = self.db_manager.get_tables()
-        for table in tables:
-            row_count = self.db_manager.get_row_count(table)
-            self.listbox.insert(tk.END, f"{table} ({row_count} records)")
+        tables = [name for name, _ in self.db_manager.get_tables_with_estimates()]
         self.filtered_tables = tables
+        self.render_tables()
+        self.db_manager.count_rows_in_background(tables)
 
-    def filter_tables(self, event):
+    def refresh_database(self):
+        # Reloads the cached schema, e.g. after another process changed the file.
+        if not self.db_path or self.current_job is not None:
+            return
+        try:
+            self.db_manager.refresh_schema()
+            self.update_tables()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to refresh database: {str(e)}")
+
+    def format_row_count(self, table):
+        row_count = self.db_manager.get_cached_row_count(table)
+        if row_count is not None:
+            return f"{row_count} records"
+        estimate = self.db_manager.table_estimates.get(table)
+        if estimate is None:
+            return "counting records"
+        return f"~{estimate} records"
+
+    def render_tables(self):
+        # Filtering and count updates only redraw the list from cached metadata;
+        # they never query the tables themselves.
+        selection = self.listbox.curselection()
+        selected = self.listbox.get(selection[0]).split(" (")[0] if selection else None
         search_text = self.search_entry.get().lower()
         self.listbox.delete(0, tk.END)
-        if not search_text:
-            self.update_tables()
-            return
         for table in self.filtered_tables:
             if search_text in table.lower():
-                row_count = self.db_manager.get_row_count(table)
-                self.listbox.insert(tk.END, f"{table} ({row_count} records)")
+                self.listbox.insert(tk.END, f"{table} ({self.format_row_count(table)})")
+                if table == selected:
+                    self.listbox.selection_set(tk.END)
+        self.row_counts_version = self.db_manager.row_counts_version
+
+    def filter_tables(self, event):
+        self.render_tables()
 
     def get_selected_table(self):
         selection = self.listbox.curselection()
@@ -230,16 +328,24 @@ class App(tk.Tk):
         return table_name
 
     def select_database(self):
+        if self.current_job is not None:
+            messagebox.showwarning("Warning", "Wait for the running export to finish")
+            return
         file_path = filedialog.askopenfilename(filetypes=[("DuckDB Files", "*.duckdb")])
         if file_path:
             try:
+                if self.export_manager:
+                    self.export_manager.close()
+                    self.export_manager = None
                 self.db_manager.change_database(file_path)
-                self.export_manager = ExportManager(file_path)
+                self.export_manager = ExportManager(
+                    file_path, connection_manager=self.db_manager.connection_manager
+                )
                 self.update_tables()
                 self.db_path = file_path
                 self.db_label.config(text=f"DB: {file_path}")
                 self.tables_frame.config(text="Tables")
-                self.progress.pack_forget()
+                self.progress_frame.pack_forget()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open database: {str(e)}")
             finally:
@@ -275,136 +381,86 @@ class App(tk.Tk):
         main_frame = tk.Frame(preview_window, bg=self.BACKGROUND_COLOR)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        canvas = tk.Canvas(main_frame, bg=self.BACKGROUND_COLOR, highlightthickness=0)
-        scrollbar_y = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollbar_x = ttk.Scrollbar(
-            main_frame, orient="horizontal", command=canvas.xview
+        # Only the rows that fit in the window exist as Treeview items; scrolling
+        # swaps them for another window of rows fetched (and cached) by the pager.
+        pager = TablePager(
+            self.db_manager.conn,
+            table,
+            self.db_manager.get_row_count(table),
+            columns=self.db_manager.schema.columns(table),
         )
-        scrollable_frame = tk.Frame(canvas, bg=self.BACKGROUND_COLOR)
-
-        scrollable_frame.bind(
-            "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        columns = pager.columns
+        tree = ttk.Treeview(
+            main_frame,
+            columns=columns,
+            show="headings",
+            selectmode="none",
+            style="Preview.Treeview",
         )
-        canvas.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        for col in columns:
+            tree.heading(col, text=col, anchor="w")
+            tree.column(col, width=max(100, len(col) * 10), stretch=False, anchor="w")
 
-        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
-        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        view = {"offset": 0, "visible": 1}
 
-        def on_mousewheel(event):
-            canvas.yview_scroll(-1 * (event.delta // 120), "units")
-
-        canvas.bind_all("<MouseWheel>", on_mousewheel)
+        def format_value(value):
+            if value is None:
+                return "NULL"
+            return str(value).replace("\n", " ")
+
+        def render():
+            tree.delete(*tree.get_children())
+            for row in pager.get_rows(view["offset"], view["visible"]):
+                tree.insert("", tk.END, values=[format_value(value) for value in row])
+            total = max(pager.row_count, 1)
+            scrollbar_y.set(
+                view["offset"] / total,
+                min(1.0, (view["offset"] + view["visible"]) / total),
+            )
 
-        columns = [
-            row[1]
-            for row in self.export_manager.conn.execute(
-                f"PRAGMA table_info({table})"
-            ).fetchall()
-        ]
-        data = self.export_manager.conn.execute(f"SELECT * FROM {table}").fetchall()
-
-        col_widths = {col: max(100, len(col) * 10) for col in columns}
-
-        header_frame = tk.Frame(scrollable_frame, bg=self.BACKGROUND_COLOR)
-        header_frame.pack(fill=tk.X)
-        headers = []
-        dividers = []
-        divider_positions = []
-        for col_idx, col in enumerate(columns):
-            header_label = tk.Label(
-                header_frame,
-                text=col,
-                font=self.FONT_BOLD,
-                fg=self.FOREGROUND_COLOR,
-                bg=self.BACKGROUND_COLOR,
-                anchor="w",
-                padx=5,
-                pady=5,
-                width=col_widths[col] // 10,
+        def scroll_to(offset):
+            offset = max(0, min(offset, pager.row_count - view["visible"]))
+            if offset != view["offset"]:
+                view["offset"] = offset
+                render()
+
+        def on_scroll(action, amount, unit=None):
+            if action == "moveto":
+                scroll_to(int(float(amount) * pager.row_count))
+            elif action == "scroll":
+                step = 1 if unit == "units" else view["visible"]
+                scroll_to(view["offset"] + int(amount) * step)
+
+        def on_resize(event):
+            visible = max(
+                1,
+                (event.height - self.PREVIEW_HEADER_HEIGHT) // self.PREVIEW_ROW_HEIGHT,
             )
-            header_label.grid(row=0, column=col_idx * 2, sticky="nsew")
-            headers.append(header_label)
-
-            if col_idx < len(columns) - 1:
-                divider_position = sum(
-                    col_widths[columns[i]] for i in range(col_idx + 1)
-                ) + (col_idx * 2)
-                divider_positions.append(divider_position)
-
-            if col_idx < len(columns) - 1:
-                divider = tk.Frame(
-                    header_frame,
-                    bg=self.FOREGROUND_COLOR,
-                    width=2,
-                    cursor="sb_h_double_arrow",
-                )
-                divider.grid(row=0, column=col_idx * 2 + 1, sticky="ns")
-                dividers.append(divider)
+            if visible != view["visible"]:
+                view["visible"] = visible
+                view["offset"] = max(0, min(view["offset"], pager.row_count - visible))
+                render()
 
-        def resize_column(event, divider_idx):
-            x = event.widget.winfo_rootx() - header_frame.winfo_rootx() + event.x
-            if divider_idx == 0:
-                start_x = 0
+        def on_mousewheel(event):
+            if event.num == 4:
+                delta = -3
+            elif event.num == 5:
+                delta = 3
             else:
-                start_x = sum(col_widths[columns[i]] for i in range(divider_idx)) + (
-                    divider_idx * 2
-                )
-            new_width = x - start_x
-            if new_width > 50:
-                col_widths[columns[divider_idx]] = new_width
-                headers[divider_idx].config(width=new_width // 10)
-                for row_frame in scrollable_frame.winfo_children()[1:]:
-                    cell = row_frame.grid_slaves(row=0, column=divider_idx * 2)[0]
-                    cell.config(width=new_width // 10, wraplength=new_width)
-                for i in range(divider_idx + 1, len(dividers)):
-                    divider_positions[i] = sum(
-                        col_widths[columns[j]] for j in range(i + 1)
-                    ) + (i * 2)
-                canvas.configure(scrollregion=canvas.bbox("all"))
-
-        for idx, divider in enumerate(dividers):
-            divider.bind("<B1-Motion>", lambda e, i=idx: resize_column(e, i))
+                delta = -3 * (event.delta // 120)
+            scroll_to(view["offset"] + delta)
 
-        def format_value(value):
-            if value is None:
-                return "NULL"
-            return str(value)
-
-        for row_idx, row in enumerate(data, start=1):
-            row_frame = tk.Frame(scrollable_frame, bg=self.CARD_COLOR)
-            row_frame.pack(fill=tk.X, pady=1)
-            formatted_row = [format_value(value) for value in row]
-            for col_idx, (value, col) in enumerate(zip(formatted_row, columns)):
-                value_width = max(
-                    100, sum(len(line) for line in str(value).split("\n")) * 7
-                )
-                col_widths[col] = max(col_widths[col], value_width)
-
-                cell_label = tk.Label(
-                    row_frame,
-                    text=value,
-                    font=self.FONT_DEFAULT,
-                    fg=self.FOREGROUND_COLOR,
-                    bg=self.CARD_COLOR,
-                    anchor="w",
-                    padx=5,
-                    pady=5,
-                    justify="left",
-                    wraplength=col_widths[col],
-                    width=col_widths[col] // 10,
-                )
-                cell_label.grid(row=0, column=col_idx * 2, sticky="nsew")
+        scrollbar_y = ttk.Scrollbar(main_frame, orient="vertical", command=on_scroll)
+        scrollbar_x = ttk.Scrollbar(main_frame, orient="horizontal", command=tree.xview)
+        tree.configure(xscrollcommand=scrollbar_x.set)
 
-        for col_idx, col in enumerate(columns):
-            header_frame.grid_columnconfigure(col_idx * 2, minsize=col_widths[col])
-            for row_frame in scrollable_frame.winfo_children()[1:]:
-                row_frame.grid_columnconfigure(col_idx * 2, minsize=col_widths[col])
-            if col_idx < len(columns) - 1:
-                header_frame.grid_columnconfigure(col_idx * 2 + 1, minsize=2)
-                for row_frame in scrollable_frame.winfo_children()[1:]:
-                    row_frame.grid_columnconfigure(col_idx * 2 + 1, minsize=2)
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        tree.bind("<Configure>", on_resize)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, on_mousewheel)
 
         ttk.Button(
             preview_window,
@@ -413,101 +469,338 @@ class App(tk.Tk):
             style="Custom.TButton",
         ).pack(pady=5)
 
-    def start_progress(self, max_value):
-        self.progress["maximum"] = max_value
-        self.progress["value"] = 0
-        self.progress.pack(pady=(0, self.PADDING))
+    def show_profile(self):
+        table = self.get_selected_table()
+        if not table or not self.export_manager:
+            return
+        profile_window = tk.Toplevel(self)
+        profile_window.title(f"Profile - {table}")
+        profile_window.geometry("800x500")
+        profile_window.configure(bg=self.BACKGROUND_COLOR)
+
+        summary_label = tk.Label(
+            profile_window,
+            text="Profiling...",
+            fg=self.FOREGROUND_COLOR,
+            bg=self.BACKGROUND_COLOR,
+            font=self.FONT_BOLD,
+            anchor="w",
+        )
+        summary_label.pack(fill=tk.X, padx=5, pady=5)
+
+        def make_tree(headings, height):
+            frame = tk.Frame(profile_window, bg=self.BACKGROUND_COLOR)
+            tree = ttk.Treeview(
+                frame,
+                columns=headings,
+                show="headings",
+                selectmode="none",
+                style="Preview.Treeview",
+                height=height,
+            )
+            for heading in headings:
+                tree.heading(heading, text=heading, anchor="w")
+                tree.column(heading, width=120, anchor="w")
+            scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            return frame, tree
+
+        columns_frame, columns_tree = make_tree(self.PROFILE_HEADINGS, 10)
+        columns_frame.pack(fill=tk.BOTH, expand=True, padx=5)
+        estimates_label = tk.Label(
+            profile_window,
+            text="Estimating exports...",
+            fg=self.FOREGROUND_COLOR,
+            bg=self.BACKGROUND_COLOR,
+            font=self.FONT_DEFAULT,
+            anchor="w",
+        )
+        estimates_label.pack(fill=tk.X, padx=5, pady=(5, 0))
+        estimates_frame, estimates_tree = make_tree(
+            self.ESTIMATE_HEADINGS, len(ExportManager.ESTIMATE_FORMATS)
+        )
+        estimates_frame.pack(fill=tk.X, padx=5)
+
+        ttk.Button(
+            profile_window,
+            text="Close",
+            command=profile_window.destroy,
+            style="Custom.TButton",
+        ).pack(pady=5)
 
-    def update_progress(self, value):
-        self.progress["value"] = value
-        self.update_idletasks()
+        # The scan and the sample exports run on their own cursors in a thread;
+        # the window polls for their results, as Tk must only be used here.
+        db_manager = self.db_manager
+        export_manager = self.export_manager
+        connection_manager = db_manager.connection_manager
+        results = {}
+
+        def compute():
+            try:
+                cursor = connection_manager.cursor()
+                try:
+                    results["profile"] = db_manager.get_table_profile(table, cursor)
+                finally:
+                    connection_manager.release(cursor)
+                results["estimates"] = export_manager.run_on_worker(
+                    ExportManager.estimate_exports, table, results["profile"].rows
+                )
+            except Exception as e:
+                results["error"] = e
+
+        def show_profile(profile):
+            text_bytes = sum(column.text_bytes for column in profile.columns)
+            summary_label.config(
+                text=f"{profile.rows:,} records, {len(profile.columns)} columns, "
+                f"{self.format_size(text_bytes)} as text"
+            )
+            for column in profile.columns:
+                nulls = profile.rows - column.non_null
+                null_ratio = nulls / profile.rows if profile.rows else 0
+                columns_tree.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        column.name,
+                        column.type,
+                        f"{nulls:,} ({null_ratio:.1%})",
+                        # Estimated counts are marked as such.
+                        f"{'' if profile.exact_distinct else '~'}{column.distinct:,}",
+                        "" if column.min is None else column.min,
+                        "" if column.max is None else column.max,
+                    ),
+                )
+
+        def show_estimates(estimates):
+            estimates_label.config(text="Estimated exports")
+            for file_format, estimate in estimates.items():
+                estimates_tree.insert(
+                    "",
+                    tk.END,
+                    values=(
+                        file_format,
+                        self.format_size(estimate["bytes"]),
+                        f"{estimate['seconds']:.1f} s",
+                    ),
+                )
+
+        def poll():
+            if not profile_window.winfo_exists():
+                return
+            if "profile" in results and not columns_tree.get_children():
+                show_profile(results["profile"])
+            if "estimates" in results:
+                show_estimates(results["estimates"])
+                return
+            if "error" in results:
+                label = estimates_label if "profile" in results else summary_label
+                label.config(text=f"Profiling failed: {str(results['error'])}")
+                return
+            profile_window.after(self.POLL_INTERVAL_MS, poll)
+
+        threading.Thread(target=compute, daemon=True).start()
+        poll()
+
+    def format_size(self, size):
+        for unit in ("bytes", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                break
+            size /= 1024
+        return f"{size:,.0f} {unit}" if unit == "bytes" else f"{size:,.1f} {unit}"
+
+    def start_progress(self, max_value):
+        # Without a known total (COPY based exports) the bar just shows activity.
+        if max_value is None:
+            self.progress.config(mode="indeterminate")
+            self.progress.start(10)
+        else:
+            self.progress.config(mode="determinate")
+            self.progress["maximum"] = max(max_value, 1)
+            self.progress["value"] = 0
+        self.progress_rows = 0
+        self.progress_phase = ""
+        self.progress_label.config(text="")
+        self.progress_frame.pack(pady=(0, self.PADDING))
+
+    def update_progress(self, rows):
+        self.progress_rows += rows
+        # COPY based exports report their rows only at the end, so the
+        # indeterminate bar is left running.
+        if str(self.progress.cget("mode")) == "determinate":
+            self.progress["value"] = self.progress_rows
+        self.update_progress_label()
+
+    def update_progress_phase(self, phase):
+        self.progress_phase = phase
+        self.update_progress_label()
+
+    def update_progress_label(self):
+        self.progress_label.config(
+            text=f"{self.progress_phase}: {self.progress_rows:,} rows"
+        )
 
     def stop_progress(self):
-        self.progress.pack_forget()
+        self.progress.stop()
+        self.progress_frame.pack_forget()
+
+    def run_export(
+        self,
+        func,
+        args,
+        max_value,
+        success_message,
+        error_message,
+        output_file,
+        kwargs=None,
+    ):
+        if self.current_job is not None:
+            messagebox.showwarning("Warning", "An export is already running")
+            return
+        self.start_progress(max_value)
+        self.current_job = self.job_executor.submit(
+            self.export_manager,
+            func,
+            args,
+            kwargs,
+            context={
+                "success_message": success_message,
+                "error_message": error_message,
+                "output_file": output_file,
+            },
+        )
+
+    def cancel_export(self):
+        if self.current_job is not None:
+            self.cancel_button.config(state=tk.DISABLED)
+            self.current_job.cancel()
+
+    def poll_jobs(self):
+        for kind, job, payload in self.job_executor.poll():
+            if kind == "progress":
+                self.update_progress(payload)
+                continue
+            if kind == "phase":
+                self.update_progress_phase(payload)
+                continue
+            self.current_job = None
+            self.cancel_button.config(state=tk.NORMAL)
+            self.stop_progress()
+            if kind == "done" and payload:
+                message = job.context["success_message"]
+                if callable(message):
+                    message = message(payload)
+                metrics = job.metrics.as_dict()
+                message += (
+                    f"\n\n{metrics['rows']:,} rows, "
+                    f"{metrics['bytes'] / (1024 * 1024):.1f} MB in "
+                    f"{metrics['seconds']:.1f} s"
+                )
+                messagebox.showinfo("Success", message)
+            elif kind == "done":
+                messagebox.showerror("Error", job.context["error_message"])
+            elif kind == "cancelled":
+                self._remove_partial_output(job.context["output_file"])
+                messagebox.showinfo("Cancelled", "Export cancelled")
+            else:
+                messagebox.showerror(
+                    "Error", f"{job.context['error_message']}: {str(payload)}"
+                )
+        if self.db_manager.row_counts_version != self.row_counts_version:
+            self.render_tables()
+        self.after(self.POLL_INTERVAL_MS, self.poll_jobs)
+
+    def _remove_partial_output(self, output_file):
+        try:
+            if output_file and os.path.isfile(output_file):
+                os.remove(output_file)
+        except OSError as e:
+            print(f"Could not remove partial export {output_file}: {str(e)}")
+
+    def on_close(self):
+        if self.current_job is not None:
+            if not messagebox.askyesno(
+                "Export running", "An export is still running. Cancel it and exit?"
+            ):
+                return
+            self.current_job.cancel()
+        self.job_executor.shutdown()
+        self.destroy()
+
+    def text_filetypes(self, label, extension):
+        # Saving as .gz or .zst compresses the export.
+        return [
+            (f"{label} Files", f"*{extension}"),
+            (f"Compressed {label} Files", f"*{extension}.gz *{extension}.zst"),
+        ]
 
     def export_sql_structure_only(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".sql", filetypes=[("SQL Files", "*.sql")]
+                defaultextension=".sql", filetypes=self.text_filetypes("SQL", ".sql")
             )
             if file_path:
-                try:
-                    self.start_progress(1)
-                    if self.export_manager.export_table_structure_only(
-                        table, file_path
-                    ):
-                        self.update_progress(1)
-                        messagebox.showinfo(
-                            "Success", f"SQL structure exported to: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror(
-                        "Error", f"Failed to export SQL structure: {str(e)}"
-                    )
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_structure_only,
+                    (table, file_path),
+                    None,
+                    f"SQL structure exported to: {file_path}",
+                    "Failed to export SQL structure",
+                    file_path,
+                )
 
     def export_sql(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".sql", filetypes=[("SQL Files", "*.sql")]
+                defaultextension=".sql", filetypes=self.text_filetypes("SQL", ".sql")
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_sql(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success",
-                            f"SQL structure and data exported to: {file_path}",
-                        )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to export to SQL: {str(e)}")
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_sql,
+                    (table, file_path),
+                    self.db_manager.get_row_count_estimate(table),
+                    f"SQL structure and data exported to: {file_path}",
+                    "Failed to export to SQL",
+                    file_path,
+                    {"resumable": self.resumable_exports.get()},
+                )
 
     def export_csv(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".csv", filetypes=[("CSV Files", "*.csv")]
+                defaultextension=".csv", filetypes=self.text_filetypes("CSV", ".csv")
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_csv(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to CSV: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to export to CSV: {str(e)}")
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_csv,
+                    (table, file_path),
+                    None,
+                    f"Data exported to CSV: {file_path}",
+                    "Failed to export to CSV",
+                    file_path,
+                    # The save dialog has already confirmed replacing the output.
+                    {"overwrite": True},
+                )
 
     def export_json(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".json", filetypes=[("JSON Files", "*.json")]
+                defaultextension=".json", filetypes=self.text_filetypes("JSON", ".json")
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_json(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to JSON: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to export to JSON: {str(e)}")
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_json,
+                    (table, file_path),
+                    None,
+                    f"Data exported to JSON: {file_path}",
+                    "Failed to export to JSON",
+                    file_path,
+                )
 
     def export_parquet(self):
         table = self.get_selected_table()
@@ -516,137 +809,73 @@ class App(tk.Tk):
                 defaultextension=".parquet", filetypes=[("Parquet Files", "*.parquet")]
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_parquet(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to Parquet: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror(
-                        "Error", f"Failed to export to Parquet: {str(e)}"
-                    )
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_parquet,
+                    (table, file_path),
+                    None,
+                    f"Data exported to Parquet: {file_path}",
+                    "Failed to export to Parquet",
+                    file_path,
+                    {"overwrite": True},
+                )
 
     def export_html(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".html", filetypes=[("HTML Files", "*.html")]
+                defaultextension=".html", filetypes=self.text_filetypes("HTML", ".html")
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_html(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to HTML: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not export to HTML: {str(e)}")
-                finally:
-                    self.stop_progress()
+                row_count = self.db_manager.get_row_count_estimate(table)
+                # Tables too large for one browser page are split into pages
+                # behind an index page.
+                rows_per_page = None
+                if row_count > self.HTML_ROWS_PER_PAGE:
+                    rows_per_page = self.HTML_ROWS_PER_PAGE
+                self.run_export(
+                    self.export_manager.export_table_html,
+                    (table, file_path, rows_per_page),
+                    row_count,
+                    f"Data exported to HTML: {file_path}",
+                    "Could not export to HTML",
+                    file_path,
+                )
 
     def export_all_tables_sql(self):
-        if not self.db_manager.get_tables():
+        tables = self.db_manager.get_tables()
+        if not tables:
             messagebox.showwarning("Warning", "There are no tables to export")
             return
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".sql", filetypes=[("SQL Files", "*.sql")]
+            defaultextension=".sql", filetypes=self.text_filetypes("SQL", ".sql")
         )
         if file_path:
-            try:
-                tables = self.db_manager.get_tables()
-                self.start_progress(len(tables))
-                with open(file_path, "w", encoding="utf-8") as f:
-                    for i, table in enumerate(tables, 1):
-                        schema = self.export_manager.get_create_table_sql(table)
-                        f.write(schema + "\n\n")
-                        data = self.export_manager.conn.execute(
-                            f"SELECT * FROM {table}"
-                        ).fetchall()
-                        columns = [
-                            row[1]
-                            for row in self.export_manager.conn.execute(
-                                f"PRAGMA table_info({table})"
-                            ).fetchall()
-                        ]
-                        for row in data:
-                            values = ", ".join(
-                                self.export_manager._escape_value(v) for v in row
-                            )
-                            f.write(
-                                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({values});\n"
-                            )
-                        self.update_progress(i)
-                self.stop_progress()
-                messagebox.showinfo("Success", f"All tables exported to: {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export all tables: {str(e)}")
-                self.stop_progress()
+            self.run_export(
+                self.export_manager.export_all_tables_sql,
+                (file_path, tables, self.EXPORT_WORKERS),
+                sum(self.db_manager.get_row_count_estimate(table) for table in tables),
+                f"All tables exported to: {file_path}",
+                "Failed to export all tables",
+                file_path,
+            )
 
     def export_all_tables_html(self):
-        if not self.db_manager.get_tables():
+        tables = self.db_manager.get_tables()
+        if not tables:
             messagebox.showwarning("Warning", "There are no tables to export")
             return
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".html", filetypes=[("HTML Files", "*.html")]
+            defaultextension=".html", filetypes=self.text_filetypes("HTML", ".html")
         )
         if file_path:
-            try:
-                tables = self.db_manager.get_tables()
-                self.start_progress(len(tables))
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write("<!DOCTYPE html>\n<html>\n<head>\n")
-                    f.write("<title>All Tables Export</title>\n")
-                    f.write("<style>\n")
-                    f.write(
-                        "table { border-collapse: collapse; width: 100%; margin-bottom: 20px; }\n"
-                    )
-                    f.write(
-                        "th, td { border: 1px solid #ddd; padding: 8px; text-align: left; white-space: pre-wrap; }\n"
-                    )
-                    f.write("th { background-color: #f2f2f2; }\n")
-                    f.write("tr:nth-child(even) { background-color: #f9f9f9; }\n")
-                    f.write("</style>\n")
-                    f.write("</head>\n<body>\n")
-                    for i, table in enumerate(tables, 1):
-                        f.write(f"<h2>Table: {table}</h2>\n")
-                        f.write("<table>\n")
-                        data = self.export_manager.conn.execute(
-                            f"SELECT * FROM {table}"
-                        ).fetchall()
-                        columns = [
-                            row[1]
-                            for row in self.export_manager.conn.execute(
-                                f"PRAGMA table_info({table})"
-                            ).fetchall()
-                        ]
-                        f.write("<tr>\n")
-                        for col in columns:
-                            f.write(
-                                f"<th>{self.export_manager._escape_html(col)}</th>\n"
-                            )
-                        f.write("</tr>\n")
-                        for row in data:
-                            f.write("<tr>\n")
-                            for value in row:
-                                f.write(
-                                    f"<td>{self.export_manager._escape_html(value)}</td>\n"
-                                )
-                            f.write("</tr>\n")
-                        f.write("</table>\n")
-                        self.update_progress(i)
-                    f.write("</body>\n</html>")
-                self.stop_progress()
-                messagebox.showinfo("Success", f"All tables exported to: {file_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to export all tables: {str(e)}")
-                self.stop_progress()
+            self.run_export(
+                self.export_manager.export_all_tables_html,
+                (file_path, tables, self.EXPORT_WORKERS),
+                sum(self.db_manager.get_row_count_estimate(table) for table in tables),
+                f"All tables exported to: {file_path}",
+                "Failed to export all tables",
+                file_path,
+            )
 
     def export_sqlite(self):
         table = self.get_selected_table()
@@ -655,44 +884,134 @@ class App(tk.Tk):
                 defaultextension=".db", filetypes=[("SQLite Files", "*.db")]
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_sqlite(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to SQLite: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror(
-                        "Error", f"Failed to export to SQLite: {str(e)}"
+                self.run_export(
+                    self.export_manager.export_table_sqlite,
+                    (table, file_path),
+                    self.db_manager.get_row_count_estimate(table),
+                    f"Data exported to SQLite: {file_path}",
+                    "Failed to export to SQLite",
+                    file_path,
+                    {"resumable": self.resumable_exports.get()},
+                )
+
+    def export_all_tables_sqlite(self):
+        tables = self.db_manager.schema.table_names("table")
+        if not tables:
+            messagebox.showwarning("Warning", "There are no tables to export")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".db", filetypes=[("SQLite Files", "*.db")]
+        )
+        if file_path:
+
+            def success_message(results):
+                lines = [
+                    f"{result['table']}: {result['rows']} rows, "
+                    f"{result['rows_per_second']:.0f} rows/s"
+                    for result in results[: self.MAX_SUMMARY_LINES]
+                ]
+                if len(results) > self.MAX_SUMMARY_LINES:
+                    lines.append(
+                        f"... and {len(results) - self.MAX_SUMMARY_LINES} more"
                     )
-                finally:
-                    self.stop_progress()
+                return f"All tables exported to SQLite: {file_path}\n\n" + "\n".join(
+                    lines
+                )
+
+            self.run_export(
+                self.export_manager.export_all_tables_sqlite,
+                (file_path, tables),
+                sum(self.db_manager.get_row_count_estimate(table) for table in tables),
+                success_message,
+                "Failed to export all tables to SQLite",
+                file_path,
+                {"resumable": self.resumable_exports.get()},
+            )
 
     def export_xml(self):
         table = self.get_selected_table()
         if table and self.export_manager:
             file_path = filedialog.asksaveasfilename(
-                defaultextension=".xml", filetypes=[("XML Files", "*.xml")]
+                defaultextension=".xml", filetypes=self.text_filetypes("XML", ".xml")
             )
             if file_path:
-                try:
-                    row_count = self.db_manager.get_row_count(table)
-                    self.start_progress(row_count)
-                    if self.export_manager.export_table_xml(table, file_path):
-                        self.update_progress(row_count)
-                        messagebox.showinfo(
-                            "Success", f"Data exported to XML: {file_path}"
-                        )
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not export to XML: {str(e)}")
-                finally:
-                    self.stop_progress()
+                self.run_export(
+                    self.export_manager.export_table_xml,
+                    (table, file_path),
+                    self.db_manager.get_row_count_estimate(table),
+                    f"Data exported to XML: {file_path}",
+                    "Could not export to XML",
+                    file_path,
+                )
+
+    def export_database_snapshot(self):
+        tables = self.db_manager.get_tables()
+        if not tables:
+            messagebox.showwarning("Warning", "There are no tables to export")
+            return
+        output_dir = filedialog.askdirectory(title="Select the snapshot folder")
+        if output_dir:
+
+            def success_message(manifest):
+                return (
+                    f"Snapshot of {len(manifest['tables'])} tables written to: "
+                    f"{output_dir}"
+                )
+
+            self.run_export(
+                self.export_manager.export_database_snapshot,
+                (output_dir,),
+                sum(self.db_manager.get_row_count_estimate(table) for table in tables),
+                success_message,
+                "Failed to export the database snapshot",
+                None,
+                {"workers": self.EXPORT_WORKERS},
+            )
+
+    def export_query(self):
+        if not self.export_manager:
+            return
+        query = simpledialog.askstring(
+            "Export Query Result", "SQL query to export:", parent=self
+        )
+        if not query or not query.strip():
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV Files", "*.csv"),
+                ("Parquet Files", "*.parquet"),
+                ("JSON Files", "*.json"),
+                ("SQL Files", "*.sql"),
+                ("HTML Files", "*.html"),
+                ("XML Files", "*.xml"),
+                ("SQLite Files", "*.db"),
+            ],
+        )
+        if not file_path:
+            return
+        name = file_path
+        if compression_from_name(name):
+            name = os.path.splitext(name)[0]
+        extension = os.path.splitext(name)[1].lower()
+        method = self.QUERY_EXPORT_METHODS.get(extension)
+        if method is None:
+            messagebox.showerror("Error", f"Unsupported file type: {extension}")
+            return
+        self.run_export(
+            getattr(self.export_manager, method),
+            (self.QUERY_RESULT_NAME, file_path),
+            None,
+            f"Query result exported to: {file_path}",
+            "Failed to export the query result",
+            file_path,
+            {"query": query},
+        )
 
     def __del__(self):
-        if self.db_manager:
-            self.db_manager.close()
+        # The export manager only borrows a cursor of the database manager's
+        # connection, so it is released first.
         if self.export_manager:
             self.export_manager.close()
-
+        if self.db_manager:
+            self.db_manager.close()
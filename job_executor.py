@@ -0,0 +1,80 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from export_manager import ExportCancelled
+from export_metrics import ExportMetrics
+
+
+class ExportJob:
+
+    def __init__(self, export_manager, func, args, kwargs, context):
+        self.export_manager = export_manager
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context or {}
+        self.cancel_event = threading.Event()
+        self.metrics = None
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.export_manager.interrupt()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+
+class JobExecutor:
+
+    def __init__(self, max_workers=1):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.events = queue.Queue()
+
+    def submit(self, export_manager, func, args=(), kwargs=None, context=None):
+        job = ExportJob(export_manager, func, args, kwargs or {}, context)
+        self.pool.submit(self._run, job)
+        return job
+
+    def _on_metrics_event(self, job, event):
+        if event["event"] == "rows":
+            self.events.put(("progress", job, event["rows"]))
+        elif event["event"] == "phase":
+            self.events.put(("phase", job, event["phase"]))
+
+    def _run(self, job):
+        export_manager = job.export_manager
+        export_manager.cancel_event = job.cancel_event
+        job.metrics = ExportMetrics(
+            callback=lambda event: self._on_metrics_event(job, event)
+        )
+        export_manager.metrics = job.metrics
+        try:
+            result = job.func(*job.args, **job.kwargs)
+            job.metrics.finish()
+            if job.cancelled:
+                self.events.put(("cancelled", job, None))
+            else:
+                self.events.put(("done", job, result))
+        except Exception as e:
+            # An interrupted DuckDB statement surfaces as its own error type, so
+            # the cancel flag decides how the failure is reported.
+            if job.cancelled or isinstance(e, ExportCancelled):
+                self.events.put(("cancelled", job, None))
+            else:
+                self.events.put(("error", job, e))
+        finally:
+            export_manager.cancel_event = None
+            export_manager.metrics = None
+
+    def poll(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
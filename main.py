@@ -1,5 +1,14 @@
-from gui import App
+import sys
 
 if __name__ == "__main__":
+    # Any command line arguments select the headless mode, which must not pull
+    # in tkinter.
+    if len(sys.argv) > 1:
+        from cli import main
+
+        sys.exit(main(sys.argv[1:]))
+
+    from gui import App
+
     app = App()
     app.mainloop()
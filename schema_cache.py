@@ -0,0 +1,74 @@
+import threading
+from collections import namedtuple
+
+ColumnSchema = namedtuple(
+    "ColumnSchema", ["name", "type", "not_null", "default", "primary_key"]
+)
+TableSchema = namedtuple(
+    "TableSchema", ["name", "kind", "columns", "sql", "estimated_size"]
+)
+
+
+class SchemaCache:
+    # One row per column of every table and view in the current schema, with
+    # the table level details repeated on each row.
+    CATALOG_QUERY = """
+        SELECT c.table_name,
+               CASE WHEN v.view_name IS NULL THEN 'table' ELSE 'view' END,
+               c.column_name,
+               c.data_type,
+               NOT c.is_nullable,
+               c.column_default,
+               COALESCE(list_contains(pk.constraint_column_names, c.column_name), false),
+               COALESCE(t.sql, v.sql),
+               t.estimated_size
+        FROM duckdb_columns() c
+        LEFT JOIN duckdb_tables() t ON t.table_oid = c.table_oid
+        LEFT JOIN duckdb_views() v ON v.view_oid = c.table_oid
+        LEFT JOIN duckdb_constraints() pk
+            ON pk.table_oid = c.table_oid AND pk.constraint_type = 'PRIMARY KEY'
+        WHERE c.database_name = current_database()
+          AND c.schema_name = current_schema()
+          AND (t.table_oid IS NOT NULL OR v.view_oid IS NOT NULL)
+        ORDER BY c.table_name, c.column_index
+        """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.tables = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        tables = {}
+        for row in self.conn.execute(self.CATALOG_QUERY).fetchall():
+            name, kind, column, col_type, not_null, default, primary_key = row[:7]
+            if name not in tables:
+                tables[name] = TableSchema(name, kind, [], row[7], row[8])
+            tables[name].columns.append(
+                ColumnSchema(column, col_type, not_null, default, primary_key)
+            )
+        return tables
+
+    def _get_tables(self):
+        with self._lock:
+            if self.tables is None:
+                self.tables = self._load()
+            return self.tables
+
+    def refresh(self):
+        with self._lock:
+            self.tables = self._load()
+
+    def get(self, table_name):
+        return self._get_tables().get(table_name)
+
+    def table_names(self, kind=None):
+        return [
+            name
+            for name, table in self._get_tables().items()
+            if kind is None or table.kind == kind
+        ]
+
+    def columns(self, table_name):
+        table = self.get(table_name)
+        return [column.name for column in table.columns] if table else []
@@ -0,0 +1,164 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+from sql_types import quote_identifier
+
+MANIFEST_NAME = "manifest.json"
+SCHEMA_NAME = "schema.sql"
+POST_LOAD_NAME = "post_load.sql"
+SNAPSHOT_FORMATS = {
+    "parquet": (".parquet", "FORMAT PARQUET"),
+    "csv": (".csv", "FORMAT CSV, HEADER"),
+    "json": (".json", "FORMAT JSON"),
+}
+DEFAULT_FORMAT = "parquet"
+# Parquet has no exact counterpart for these types (integers wider than 64
+# bits, month/day/microsecond intervals, time zone offsets), so such columns are
+# stored as text, which the import casts back.
+PARQUET_TEXT_TYPES = re.compile(
+    r"\b(U?HUGEINT|INTERVAL|TIME WITH TIME ZONE|TIMETZ)\b", re.IGNORECASE
+)
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(snapshot_dir):
+    # The manifest is written last, so a snapshot without one is incomplete.
+    path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"No snapshot manifest found in {snapshot_dir}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_snapshot(snapshot_dir, manifest=None):
+    manifest = manifest or load_manifest(snapshot_dir)
+    problems = []
+    for entry in manifest["tables"]:
+        path = os.path.join(snapshot_dir, entry["file"])
+        if not os.path.exists(path):
+            problems.append(f"{entry['file']}: missing")
+        elif os.path.getsize(path) != entry["bytes"]:
+            problems.append(f"{entry['file']}: size does not match")
+        elif file_checksum(path) != entry["sha256"]:
+            problems.append(f"{entry['file']}: checksum does not match")
+    return problems
+
+
+def _load_table(conn, snapshot_dir, entry):
+    cursor = conn.cursor()
+    try:
+        path = os.path.join(snapshot_dir, entry["file"]).replace("'", "''")
+        rows = cursor.execute(
+            f"COPY {quote_identifier(entry['table'])} FROM '{path}' "
+            f"({SNAPSHOT_FORMATS[entry['format']][1]})"
+        ).fetchone()[0]
+    finally:
+        cursor.close()
+    if rows != entry["rows"]:
+        raise ValueError(
+            f"Table '{entry['table']}': loaded {rows} rows, the manifest lists "
+            f"{entry['rows']}"
+        )
+    return rows
+
+
+def import_snapshot(snapshot_dir, db_path, workers=DEFAULT_WORKERS, verify=True):
+    manifest = load_manifest(snapshot_dir)
+    if verify:
+        problems = verify_snapshot(snapshot_dir, manifest)
+        if problems:
+            raise ValueError("Snapshot is damaged: " + "; ".join(problems))
+    if os.path.exists(db_path):
+        raise ValueError(f"{db_path} already exists")
+
+    conn = duckdb.connect(db_path)
+    try:
+        with open(os.path.join(snapshot_dir, SCHEMA_NAME), "r", encoding="utf-8") as f:
+            conn.execute(f.read())
+        # Tables are loaded in waves: a table waits until every table it
+        # references is loaded, and the tables of one wave load in parallel.
+        pending = list(manifest["tables"])
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while pending:
+                names = {entry["table"] for entry in pending}
+                wave = [
+                    entry
+                    for entry in pending
+                    if not set(entry.get("references", [])) & names
+                ] or pending
+                list(
+                    pool.map(lambda entry: _load_table(conn, snapshot_dir, entry), wave)
+                )
+                pending = [entry for entry in pending if entry not in wave]
+        # Indexes and views come after the data, as in the source export.
+        with open(
+            os.path.join(snapshot_dir, POST_LOAD_NAME), "r", encoding="utf-8"
+        ) as f:
+            post_load = f.read()
+        if post_load.strip():
+            conn.execute(post_load)
+    except BaseException:
+        conn.close()
+        for path in (db_path, db_path + ".wal"):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    conn.close()
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Verify or import a database snapshot."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("import", help="load a snapshot into a new database")
+    load.add_argument("snapshot_dir")
+    load.add_argument("database", help="path of the DuckDB file to create")
+    load.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    load.add_argument(
+        "--no-verify", action="store_true", help="skip the checksum verification"
+    )
+
+    verify = commands.add_parser("verify", help="check a snapshot's checksums")
+    verify.add_argument("snapshot_dir")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "import":
+            manifest = import_snapshot(
+                args.snapshot_dir, args.database, args.workers, not args.no_verify
+            )
+            print(f"Imported {len(manifest['tables'])} tables into: {args.database}")
+            return 0
+        problems = verify_snapshot(args.snapshot_dir)
+    except (OSError, ValueError, duckdb.Error) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+    for problem in problems:
+        print(problem)
+    if problems:
+        return 1
+    print("Snapshot is intact")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+INTEGER_TYPES = {
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+}
+# Integers that may not fit in SQLite's signed 64-bit INTEGER.
+WIDE_INTEGER_TYPES = {"UBIGINT", "HUGEINT", "UHUGEINT"}
+FLOAT_TYPES = {"FLOAT", "DOUBLE", "REAL"}
+BLOB_TYPES = {"BLOB", "BYTEA"}
+
+
+def type_category(col_type):
+    col_type = col_type.strip().upper()
+    if col_type.endswith("]") or col_type.startswith(("STRUCT(", "MAP(")):
+        return "nested"
+    if col_type.startswith("UNION("):
+        return "union"
+    if col_type in INTEGER_TYPES or col_type == "BOOLEAN":
+        return "integer"
+    if col_type in WIDE_INTEGER_TYPES:
+        return "wide_integer"
+    if col_type.startswith(("DECIMAL", "NUMERIC")):
+        return "decimal"
+    if col_type in FLOAT_TYPES:
+        return "float"
+    if col_type in BLOB_TYPES:
+        return "blob"
+    return "text"
+
+
+def split_fields(inner):
+    # "n INTEGER, s STRUCT(a INTEGER, b VARCHAR)" -> ["n INTEGER", "s STRUCT(...)"]
+    fields = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(inner):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            fields.append(inner[start:i].strip())
+            start = i + 1
+    fields.append(inner[start:].strip())
+    return [field for field in fields if field]
+
+
+def union_members(col_type):
+    members = []
+    for field in split_fields(col_type.strip()[len("UNION(") : -1]):
+        if field.startswith('"'):
+            end = field.index('"', 1)
+            while field[end + 1 : end + 2] == '"':
+                end = field.index('"', end + 2)
+            name = field[1:end].replace('""', '"')
+            member_type = field[end + 1 :].strip()
+        else:
+            name, member_type = field.split(None, 1)
+        members.append((name, member_type))
+    return members
+
+
+def quote_literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _quoted_expr(value_expr):
+    return f"'''' || replace({value_expr}, '''', '''''') || ''''"
+
+
+def literal_expr(column_expr, col_type):
+    # A DuckDB expression rendering one column as SQL literal text. The
+    # formatter is chosen once per column from its type; NULLs become NULL.
+    category = type_category(col_type)
+    value = f"CAST({column_expr} AS VARCHAR)"
+    if category in ("integer", "wide_integer", "decimal"):
+        rendered = value
+    elif category == "float":
+        # inf and nan have no unquoted literal.
+        rendered = (
+            f"CASE WHEN isfinite({column_expr}) THEN {value} "
+            f"ELSE 'CAST(' || {_quoted_expr(value)} || {quote_literal(f' AS {col_type})')} END"
+        )
+    elif category in ("nested", "blob"):
+        # DuckDB reads its own text form of these types back through a cast.
+        rendered = (
+            f"'CAST(' || {_quoted_expr(value)} || {quote_literal(f' AS {col_type})')}"
+        )
+    elif category == "union":
+        # The text form of a union drops the member, so the literal names it.
+        branches = " ".join(
+            f"WHEN {quote_literal(name)} THEN 'union_value(' || "
+            f"{quote_literal(quote_identifier(name) + ' := ')} || "
+            f"{literal_expr(f'union_extract({column_expr}, {quote_literal(name)})', member_type)}"
+            f" || ')'"
+            for name, member_type in union_members(col_type)
+        )
+        rendered = f"CASE union_tag({column_expr}) {branches} END"
+    else:
+        rendered = _quoted_expr(value)
+    return f"COALESCE({rendered}, 'NULL')"
+
+
+SQLITE_TYPES = {
+    "integer": "INTEGER",
+    "wide_integer": "TEXT",
+    "decimal": "NUMERIC",
+    "float": "REAL",
+    "blob": "BLOB",
+    "nested": "TEXT",
+    "union": "TEXT",
+    "text": "TEXT",
+}
+
+
+def sqlite_type(col_type):
+    return SQLITE_TYPES[type_category(col_type)]
+
+
+def sqlite_value_expr(column_expr, col_type):
+    # DuckDB converts every value into something sqlite3 can bind: nested
+    # values become JSON and anything without a SQLite counterpart (decimals,
+    # dates, UUIDs, wide integers...) becomes text.
+    category = type_category(col_type)
+    if category in ("integer", "float", "blob"):
+        return column_expr
+    if category in ("nested", "union"):
+        return f"CAST(to_json({column_expr}) AS VARCHAR)"
+    return f"CAST({column_expr} AS VARCHAR)"
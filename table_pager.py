@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+from sql_types import quote_identifier
+
+
+class TablePager:
+    DEFAULT_PAGE_SIZE = 200
+    DEFAULT_CACHE_PAGES = 50
+
+    def __init__(
+        self,
+        conn,
+        table_name,
+        row_count,
+        page_size=DEFAULT_PAGE_SIZE,
+        cache_pages=DEFAULT_CACHE_PAGES,
+        columns=None,
+    ):
+        self.conn = conn
+        self.table_name = table_name
+        self.row_count = row_count
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self.pages = OrderedDict()
+        self.columns = columns or [
+            row[1]
+            for row in conn.execute(
+                f"PRAGMA table_info({quote_identifier(table_name)})"
+            ).fetchall()
+        ]
+
+    def _get_page(self, page_index):
+        if page_index in self.pages:
+            self.pages.move_to_end(page_index)
+            return self.pages[page_index]
+        rows = self.conn.execute(
+            f"SELECT * FROM {quote_identifier(self.table_name)} "
+            f"LIMIT {self.page_size} "
+            f"OFFSET {page_index * self.page_size}"
+        ).fetchall()
+        self.pages[page_index] = rows
+        # Least recently used pages are evicted first.
+        if len(self.pages) > self.cache_pages:
+            self.pages.popitem(last=False)
+        return rows
+
+    def get_rows(self, start, count):
+        rows = []
+        first_page = start // self.page_size
+        last_page = (start + count - 1) // self.page_size
+        for page_index in range(first_page, last_page + 1):
+            rows.extend(self._get_page(page_index))
+        skip = start - first_page * self.page_size
+        return rows[skip : skip + count]
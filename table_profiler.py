@@ -0,0 +1,48 @@
+from collections import namedtuple
+
+from sql_types import quote_identifier, type_category
+
+ColumnProfile = namedtuple(
+    "ColumnProfile",
+    ["name", "type", "non_null", "distinct", "min", "max", "text_bytes"],
+)
+TableProfile = namedtuple("TableProfile", ["name", "rows", "columns", "exact_distinct"])
+# Up to this many (estimated) rows distinct values are counted exactly; larger
+# tables use DuckDB's HyperLogLog estimate.
+EXACT_DISTINCT_MAX_ROWS = 100000
+
+
+def profile_query(table_name, column_info, exact_distinct=False):
+    # Every statistic of every column comes from one aggregate scan. Sizes are
+    # measured on the values' text form, which is what the text formats write.
+    aggregates = ["count(*)"]
+    for name, col_type in column_info:
+        column = quote_identifier(name)
+        ordered = type_category(col_type) not in ("nested", "union", "blob")
+        aggregates += [
+            f"count({column})",
+            (
+                f"count(DISTINCT {column})"
+                if exact_distinct
+                # The estimate can exceed the number of values it counts.
+                else f"least(approx_count_distinct({column}), count({column}))"
+            ),
+            f"CAST(min({column}) AS VARCHAR)" if ordered else "NULL",
+            f"CAST(max({column}) AS VARCHAR)" if ordered else "NULL",
+            f"COALESCE(sum(strlen(CAST({column} AS VARCHAR))), 0)",
+        ]
+    return f"SELECT {', '.join(aggregates)} FROM {quote_identifier(table_name)}"
+
+
+def profile_table(conn, table_name, column_info, estimated_rows=None):
+    exact_distinct = (
+        estimated_rows is not None and estimated_rows <= EXACT_DISTINCT_MAX_ROWS
+    )
+    row = conn.execute(
+        profile_query(table_name, column_info, exact_distinct)
+    ).fetchone()
+    columns = [
+        ColumnProfile(name, col_type, *row[1 + 5 * i : 6 + 5 * i])
+        for i, (name, col_type) in enumerate(column_info)
+    ]
+    return TableProfile(table_name, row[0], columns, exact_distinct)
@@ -0,0 +1,41 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+from export_manager import ExportManager
+
+
+def test_parallel_incremental_exports_keep_every_watermark(tmp_path):
+    path = str(tmp_path / "source.duckdb")
+    conn = duckdb.connect(path)
+    tables = [f"t{i}" for i in range(12)]
+    for table in tables:
+        conn.execute(f"CREATE TABLE {table} AS SELECT range AS id FROM range(100)")
+    conn.close()
+
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    manager = ExportManager(path)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(
+                pool.map(
+                    lambda table: manager.run_on_worker(
+                        ExportManager.export_table_incremental,
+                        table,
+                        str(output_dir / f"{table}.parquet"),
+                        "id",
+                    ),
+                    tables,
+                )
+            )
+    finally:
+        manager.close()
+
+    assert all(result["rows"] == 100 for result in results)
+    with open(output_dir / ExportManager.STATE_FILE_NAME, encoding="utf-8") as f:
+        state = json.load(f)
+    (outputs,) = state.values()
+    assert sorted(outputs) == sorted(tables)
+    assert not [name for name in output_dir.iterdir() if name.suffix == ".tmp"]
@@ -0,0 +1,114 @@
+import gzip
+import sqlite3
+
+import duckdb
+import pytest
+
+from checkpoint import ExportCheckpoint
+from export_manager import ExportManager
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "source.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE SEQUENCE s1;
+        CREATE TABLE parent (id INTEGER PRIMARY KEY DEFAULT nextval('s1'), name VARCHAR);
+        CREATE TABLE child (id INTEGER, parent_id INTEGER REFERENCES parent (id));
+        CREATE INDEX child_parent ON child (parent_id);
+        CREATE VIEW named AS SELECT name FROM parent;
+        INSERT INTO parent (name) SELECT 'name ' || i FROM range(250) t(i);
+        INSERT INTO child SELECT i, i % 250 + 1 FROM range(500) t(i);
+        """)
+    conn.close()
+    return path
+
+
+def read_dump(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def replay(dump, tmp_path):
+    conn = duckdb.connect(str(tmp_path / "restored.duckdb"))
+    conn.execute(dump)
+    counts = (
+        conn.execute("SELECT count(*) FROM parent").fetchone()[0],
+        conn.execute("SELECT count(*) FROM child").fetchone()[0],
+        conn.execute("SELECT count(*) FROM named").fetchone()[0],
+    )
+    conn.close()
+    return counts
+
+
+@pytest.mark.parametrize("file_name", ["dump.sql", "dump.sql.gz"])
+def test_resumable_all_tables_sql(database, tmp_path, file_name):
+    output_file = str(tmp_path / file_name)
+    manager = ExportManager(database, batch_size=100)
+    try:
+        manager.export_all_tables_sql(output_file, resumable=True)
+    finally:
+        manager.close()
+    assert replay(read_dump(output_file), tmp_path) == (250, 500, 250)
+
+
+def test_resumable_all_tables_sql_continues_after_interruption(
+    database, tmp_path, monkeypatch
+):
+    output_file = str(tmp_path / "dump.sql.gz")
+    commit = ExportCheckpoint.commit
+    commits = []
+
+    def interrupted_commit(self):
+        commit(self)
+        commits.append(self.state["bytes"])
+        if len(commits) == 4:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(ExportCheckpoint, "commit", interrupted_commit)
+    manager = ExportManager(database, batch_size=100)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            manager.export_all_tables_sql(output_file, resumable=True)
+        monkeypatch.setattr(ExportCheckpoint, "commit", commit)
+        manager.export_all_tables_sql(output_file, resumable=True)
+    finally:
+        manager.close()
+    assert replay(read_dump(output_file), tmp_path) == (250, 500, 250)
+
+
+def test_resumable_sqlite_continues_after_interruption(database, tmp_path, monkeypatch):
+    output_file = str(tmp_path / "dump.db")
+    commit = ExportCheckpoint.commit
+    commits = []
+
+    def interrupted_commit(self):
+        commit(self)
+        commits.append(self.state["bytes"])
+        if len(commits) == 5:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(ExportManager, "SQLITE_CHECKPOINT_ROWS", 100)
+    monkeypatch.setattr(ExportCheckpoint, "commit", interrupted_commit)
+    manager = ExportManager(database, batch_size=30)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            manager.export_all_tables_sqlite(output_file, resumable=True)
+        monkeypatch.setattr(ExportCheckpoint, "commit", commit)
+        manager.export_all_tables_sqlite(output_file, resumable=True)
+    finally:
+        manager.close()
+
+    conn = sqlite3.connect(output_file)
+    try:
+        assert conn.execute(
+            "SELECT count(*), count(DISTINCT id) FROM child"
+        ).fetchone() == (500, 500)
+        assert conn.execute("SELECT count(*) FROM parent").fetchone() == (250,)
+        assert conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall() == [("child_parent",)]
+    finally:
+        conn.close()
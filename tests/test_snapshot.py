@@ -0,0 +1,56 @@
+import duckdb
+
+import snapshot
+from export_manager import ExportManager
+
+
+def test_snapshot_restores_every_value(tmp_path):
+    path = str(tmp_path / "source.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE TABLE typed (
+            id INTEGER PRIMARY KEY,
+            h HUGEINT,
+            uh UHUGEINT,
+            iv INTERVAL,
+            tz TIMETZ,
+            bl BLOB,
+            un UNION(n INTEGER, t VARCHAR),
+            s VARCHAR,
+            f DOUBLE,
+            l HUGEINT[],
+            st STRUCT(a INTEGER, b VARCHAR)
+        );
+        INSERT INTO typed VALUES
+            (1, -170141183460469231731687303715884105728,
+             340282366920938463463374607431768211455,
+             INTERVAL '1 month 2 days 3 microseconds', '12:00:00+03', ''::BLOB,
+             NULL, '', 'nan', [1, NULL], {'a': 1, 'b': 'x'}),
+            (2, NULL, NULL, NULL, NULL, NULL, union_value(t := 'NULL'), NULL,
+             '-inf', [], NULL);
+        """)
+    conn.close()
+
+    snapshot_dir = str(tmp_path / "snapshot")
+    manager = ExportManager(path)
+    try:
+        manifest = manager.export_database_snapshot(snapshot_dir)
+    finally:
+        manager.close()
+    assert [entry["format"] for entry in manifest["tables"]] == ["parquet"]
+
+    restored = str(tmp_path / "restored.duckdb")
+    snapshot.import_snapshot(snapshot_dir, restored)
+    conn = duckdb.connect(restored)
+    try:
+        conn.execute(f"ATTACH '{path}' AS source (READ_ONLY)")
+        original = conn.execute("SELECT * FROM source.typed ORDER BY id").fetchall()
+        copied = conn.execute("SELECT * FROM typed ORDER BY id").fetchall()
+        missing = conn.execute(
+            "SELECT count(*) FROM (SELECT * FROM source.typed "
+            "EXCEPT ALL SELECT * FROM typed)"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    assert repr(copied) == repr(original)
+    assert missing == 0